@@ -0,0 +1,472 @@
+from fastapi import APIRouter, BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.util import get_remote_address
+from slowapi.errors import RateLimitExceeded
+import asyncio
+import logging
+import orjson
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Any
+
+from app import database
+from app.models import QueryRequest, QueryResponse, RAGStrategyRequest
+from app.prompts import render_system_prompt
+from app import gemini_client as gemini
+from app.modular_rag import modular_rag, get_reranker, RAGStrategy
+from app.memory import conversation_memory
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Answer returned when retrieval finds no relevant papers
+NO_DOCUMENTS_ANSWER = (
+    "I couldn't find any relevant research papers in my database to answer your question. "
+    "Please try rephrasing or asking about a different topic."
+)
+
+# Rate limiting configuration
+limiter = Limiter(key_func=get_remote_address)
+
+app = FastAPI(
+    title="Academic Research Assistant - Gemini",
+    description="AI-powered research assistant using arXiv data and Gemini Pro",
+    version="1.0.0"
+)
+
+# JSON API routes, served both at the root and under /api for the web frontend
+router = APIRouter()
+
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+# CORS configuration
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZip middleware that passes Server-Sent Event endpoints through untouched.
+    Older Starlette releases compress (and therefore buffer) event streams,
+    which would hold back every token until the answer is complete.
+    """
+
+    uncompressed_paths = frozenset({"/query/stream", "/api/query/stream"})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.uncompressed_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Compress larger responses such as the retrieved context documents
+app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=1024)
+
+# Static assets and HTML pages of the web interface
+app.mount("/static", StaticFiles(directory="static"), name="static")
+templates = Jinja2Templates(directory="templates")
+
+# Templates don't change while the server runs, so skip the per-render mtime check
+templates.env.auto_reload = False
+
+class PerformanceMetrics:
+    """
+    Collects and exposes API performance metrics including average response time,
+    total requests, success rate, and error count.
+    """
+
+    def __init__(self):
+        self.request_times = deque(maxlen=100)
+        self._total_time = 0.0
+        self.error_count = 0
+        self.success_count = 0
+
+    def record_request(self, duration: float, success: bool = True):
+        """
+        Record a single request's duration and whether it succeeded.
+        Keeps a sliding window of the last 100 requests with a running sum.
+        """
+        if len(self.request_times) == self.request_times.maxlen:
+            self._total_time -= self.request_times[0]
+        self.request_times.append(duration)
+        self._total_time += duration
+
+        if success:
+            self.success_count += 1
+        else:
+            self.error_count += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Return aggregated performance metrics.
+        """
+        if not self.request_times:
+            return {"average_response_time": 0, "success_rate": 1.0}
+
+        avg_time = self._total_time / len(self.request_times)
+        total_requests = self.success_count + self.error_count
+        success_rate = self.success_count / total_requests if total_requests > 0 else 1.0
+
+        return {
+            "average_response_time": round(avg_time, 2),
+            "success_rate": round(success_rate, 2),
+            "total_requests": total_requests,
+            "error_count": self.error_count
+        }
+
+
+metrics = PerformanceMetrics()
+
+@app.on_event("startup")
+async def warmup():
+    """
+    Warm up heavy dependencies so the first query doesn't pay cold-start costs:
+    embedding model and HNSW index load, the cross-encoder reranker,
+    Gemini connection setup, and Redis.
+    Failures are logged and never abort startup.
+    """
+    try:
+        database.vector_db.search("warmup", top_k=1)
+    except Exception as e:
+        logger.warning("Vector database warmup failed: %s", e)
+
+    # Logs and falls back to keyword reranking on its own
+    get_reranker()
+
+    try:
+        await gemini.gemini_client.model.generate_content_async("ping")
+    except Exception as e:
+        logger.warning("Gemini warmup failed: %s", e)
+
+    try:
+        if conversation_memory.redis_client:
+            conversation_memory.redis_client.ping()
+    except Exception as e:
+        logger.warning("Redis warmup failed: %s", e)
+
+
+@app.middleware("http")
+async def add_process_time_header(request: Request, call_next):
+    """
+    Middleware that measures request processing time and stores performance metrics.
+    Adds X-Process-Time header to all responses.
+    """
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    process_time = time.perf_counter() - start_time
+    response.headers["X-Process-Time"] = str(process_time)
+
+    metrics.record_request(process_time, success=response.status_code < 400)
+
+    return response
+
+
+@lru_cache(maxsize=None)
+def render_page(name: str) -> str:
+    """
+    Render a page template once; the pages have no per-request state.
+    """
+    return templates.get_template(name).render()
+
+
+@app.get("/")
+async def root(request: Request):
+    """
+    Root endpoint: the landing page for browsers, general API metadata otherwise.
+    """
+    if "text/html" in request.headers.get("accept", ""):
+        return HTMLResponse(render_page("index.html"))
+
+    return {
+        "message": "Academic Research Assistant API",
+        "version": "1.0.0",
+        "llm": "Gemini Pro",
+        "data_source": "arXiv 2020",
+        "features": ["modular_rag", "conversation_memory", "rate_limiting"]
+    }
+
+
+@app.get("/chat", response_class=HTMLResponse)
+async def chat_interface():
+    """
+    Render the chat interface page.
+    """
+    return HTMLResponse(render_page("chat.html"))
+
+
+@router.post("/query", response_model=QueryResponse)
+@limiter.limit("10/minute")
+async def query_documents(
+    request: Request,
+    query_request: QueryRequest,
+    background_tasks: BackgroundTasks,
+    session_id: str = "default"
+):
+    """
+    Main endpoint for executing RAG-based academic research queries.
+    Supports multiple RAG strategies and conversation memory.
+    """
+    start_time = time.perf_counter()
+
+    try:
+        logger.info("Processing question: %s", query_request.question)
+
+        # Already normalized to a RAGStrategy by QueryRequest validation
+        rag_strategy = query_request.strategy
+
+        rag_results, history_context = await retrieve_with_history(query_request, session_id)
+
+        if not rag_results['documents']:
+            response = QueryResponse(
+                answer=NO_DOCUMENTS_ANSWER,
+                sources=[],
+                context=[],
+                strategy=rag_strategy.value
+            )
+
+            background_tasks.add_task(
+                conversation_memory.store_conversation,
+                session_id, query_request.question,
+                response.answer, response.sources
+            )
+            return response
+
+        context_documents = rag_results['documents']
+        metadatas = rag_results.get('metadatas', [])
+
+        formatted_context, sources = format_context_and_sources(context_documents, metadatas)
+
+        prompt = build_prompt(query_request.question, formatted_context, history_context)
+
+        answer = await gemini.gemini_client.generate_response(prompt)
+
+        response = QueryResponse(
+            answer=answer,
+            sources=sources,
+            context=context_documents,
+            strategy=rag_strategy.value,
+            processing_time=round(time.perf_counter() - start_time, 2)
+        )
+
+        # Stored after the response has been sent
+        background_tasks.add_task(
+            conversation_memory.store_conversation,
+            session_id, query_request.question, answer, sources
+        )
+
+        return response
+
+    except Exception as e:
+        logger.error("Error processing query: %s", e)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.post("/query/stream")
+@limiter.limit("10/minute")
+async def query_documents_stream(
+    request: Request,
+    query_request: QueryRequest,
+    session_id: str = "default"
+):
+    """
+    Streaming variant of /query that sends the answer as Server-Sent Events
+    while Gemini generates it. Each token arrives as a `data:` event; a final
+    `done` event carries the sources. The complete answer is stored in
+    conversation memory once the stream finishes.
+    """
+    try:
+        logger.info("Processing streaming question: %s", query_request.question)
+
+        # Already normalized to a RAGStrategy by QueryRequest validation
+        rag_strategy = query_request.strategy
+
+        rag_results, history_context = await retrieve_with_history(query_request, session_id)
+
+        if rag_results['documents']:
+            formatted_context, sources = format_context_and_sources(
+                rag_results['documents'], rag_results.get('metadatas', [])
+            )
+            prompt = build_prompt(query_request.question, formatted_context, history_context)
+        else:
+            prompt, sources = None, []
+
+    except Exception as e:
+        logger.error("Error processing query: %s", e)
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+    async def event_stream():
+        answer_parts = []
+        if prompt is None:
+            answer_parts.append(NO_DOCUMENTS_ANSWER)
+            yield f"data: {orjson.dumps({'token': NO_DOCUMENTS_ANSWER}).decode()}\n\n"
+        else:
+            async for text in gemini.gemini_client.stream_response(prompt):
+                answer_parts.append(text)
+                yield f"data: {orjson.dumps({'token': text}).decode()}\n\n"
+
+        done = {"sources": sources, "strategy": rag_strategy.value}
+        yield f"event: done\ndata: {orjson.dumps(done).decode()}\n\n"
+
+        conversation_memory.store_conversation(
+            session_id, query_request.question, "".join(answer_parts), sources
+        )
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.post("/query/strategy", response_model=QueryResponse)
+@limiter.limit("10/minute")
+async def query_with_strategy(
+    request: Request,
+    strategy_request: RAGStrategyRequest,
+    background_tasks: BackgroundTasks
+):
+    """
+    Endpoint that allows selecting a RAG strategy explicitly.
+    """
+    query_request = QueryRequest(
+        question=strategy_request.question,
+        strategy=strategy_request.strategy,
+        top_k=strategy_request.top_k
+    )
+
+    return await query_documents(
+        request, query_request, background_tasks, strategy_request.session_id
+    )
+
+
+@router.get("/conversation/{session_id}")
+async def get_conversation(session_id: str, limit: int = 10):
+    """
+    Retrieve conversation history for a given session.
+    """
+    history = conversation_memory.get_conversation_history(session_id, limit)
+    return {"session_id": session_id, "history": history}
+
+
+@router.delete("/conversation/{session_id}")
+async def clear_conversation(session_id: str):
+    """
+    Clear stored conversation history for a specified session.
+    """
+    conversation_memory.clear_conversation(session_id)
+    modular_rag.clear_cache()
+    return {"message": f"Conversation history for {session_id} cleared"}
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Retrieve API performance metrics.
+    """
+    return metrics.get_metrics()
+
+
+@router.get("/strategies")
+async def get_available_strategies():
+    """
+    List all available RAG strategies.
+    """
+    return {
+        "available_strategies": [strategy.value for strategy in RAGStrategy],
+        "default_strategy": RAGStrategy.BASIC.value
+    }
+
+
+@router.get("/stats")
+async def get_stats():
+    """
+    Return database statistics including document count and model info.
+    """
+    try:
+        collection_stats = database.vector_db.collection.count()
+        return {
+            "total_documents": collection_stats,
+            "embedding_model": "all-MiniLM-L6-v2",
+            "llm_model": "Gemini Pro"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/health")
+async def health_check():
+    """
+    Health check endpoint for monitoring service status.
+    """
+    return {"status": "healthy", "service": "Academic Research Assistant"}
+
+
+app.include_router(router)
+app.include_router(router, prefix="/api")
+
+
+async def retrieve_with_history(query_request, session_id):
+    """
+    Run retrieval and read the session history concurrently in worker threads,
+    so the Redis round-trip overlaps the Chroma query.
+
+    Returns:
+        Tuple[Dict[str, Any], str]: RAG results and formatted conversation history.
+    """
+    return await asyncio.gather(
+        asyncio.to_thread(
+            modular_rag.execute_rag,
+            question=query_request.question,
+            strategy=query_request.strategy,
+            top_k=query_request.top_k
+        ),
+        asyncio.to_thread(conversation_memory.get_formatted_history, session_id, 3)
+    )
+
+
+def build_prompt(question, formatted_context, history_context):
+    """
+    Assemble the Gemini prompt from the retrieved context and the
+    already formatted conversation history of the session.
+    """
+    if history_context:
+        return render_system_prompt(
+            question,
+            "\n\nPrevious conversation:\n", history_context,
+            "\n\nCurrent context:\n", formatted_context
+        )
+
+    return render_system_prompt(question, formatted_context)
+
+
+def format_context_and_sources(documents, metadatas):
+    """
+    Build the readable context string for the LLM prompt and the
+    user-friendly list of sources in a single pass over the results.
+
+    Returns:
+        Tuple[str, List[str]]: Formatted context and source descriptions.
+    """
+    context_parts = []
+    sources = []
+    for i, (doc, meta) in enumerate(zip(documents, metadatas), 1):
+        if meta:
+            title = meta.get('title')
+            context_parts.append(f"[Source {i}] {title}\n{doc}" if title is not None else f"[Source {i}]\n{doc}")
+
+            source = f"Source {i}: {title if title is not None else 'Unknown title'}"
+            if meta.get('authors'):
+                source += f" by {meta['authors']}"
+            sources.append(source)
+        else:
+            context_parts.append(f"[Source {i}]\n{doc}")
+            sources.append(f"Source {i}")
+    return "\n\n".join(context_parts), sources
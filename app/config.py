@@ -1,42 +1,103 @@
 import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 
-load_dotenv()
-
-# Gemini API configuration: loads the API key from environment variables
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-# ChromaDB configuration: database path and collection name for storing embeddings
-CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH", "./chroma_db")
-COLLECTION_NAME = "arxiv_papers_2020"
-
-# Model configuration: name of the LLM model used for RAG operations
-LLM_MODEL = "gemini-2.5-flash"
-
-# RAG-related settings: number of results retrieved and maximum context size
-TOP_K_RESULTS = 3
-MAX_CONTEXT_LENGTH = 2000
-
-# Data configuration: path to dataset and batch size for processing
-DATA_PATH = os.getenv("DATA_PATH", "./data/filtered_arxiv_2020.json")
-BATCH_SIZE = 100
-
-# Gemini safety settings: defines allowed content categories and moderation thresholds
-GEMINI_SAFETY_SETTINGS = [
-    {
-        "category": "HARM_CATEGORY_HARASSMENT",
-        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-    },
-    {
-        "category": "HARM_CATEGORY_HATE_SPEECH", 
-        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-    },
-    {
-        "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-    },
-    {
-        "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-    }
-]
+
+@lru_cache(maxsize=None)
+def load_env():
+    """
+    Load variables from the .env file once per process,
+    so repeated imports don't re-parse the file.
+    """
+    load_dotenv()
+
+
+def _env(name: str, default: Optional[str] = None):
+    """
+    Dataclass field whose value is read from an environment variable
+    when the configuration is instantiated.
+    """
+    return field(default_factory=lambda: os.getenv(name, default))
+
+
+def _env_flag(name: str, default: bool):
+    """
+    Boolean dataclass field read from an environment variable
+    ("1", "true", "yes" or "on" enable it).
+    """
+    return field(default_factory=lambda: os.getenv(name, str(default)).lower() in ("1", "true", "yes", "on"))
+
+
+@dataclass(frozen=True)
+class Config:
+    """
+    Application settings, resolved from the environment exactly once.
+    Hot code reads plain attributes instead of querying os.environ.
+    """
+
+    # Gemini API configuration: loads the API key from environment variables
+    gemini_api_key: Optional[str] = _env("GEMINI_API_KEY")
+
+    # ChromaDB configuration: database path and collection name for storing embeddings
+    chroma_db_path: str = _env("CHROMA_DB_PATH", "./chroma_db")
+    collection_name: str = "arxiv_papers_2020"
+
+    # Document embedding cache: vectors are reused per (provider, model, content hash)
+    embedding_provider: str = "chromadb-onnx"
+    embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_cache_path: str = _env("EMBEDDING_CACHE_PATH", "./embedding_cache.db")
+    embedding_cache_max_rows: int = 500_000
+
+    # Model configuration: name of the LLM model used for RAG operations
+    llm_model: str = "gemini-2.5-flash"
+
+    # Gemini retry policy: attempts and exponential backoff bounds (seconds)
+    gemini_max_retries: int = 3
+    gemini_retry_base_delay: float = 2
+    gemini_retry_max_delay: float = 30
+
+    # RAG-related settings: number of results retrieved and maximum context size
+    top_k_results: int = 3
+    max_context_length: int = 2000
+
+    # Short-lived cache of retrieval results for repeated questions
+    rag_cache_max_entries: int = 4096
+    rag_cache_ttl: int = 300
+
+    # Reranking: cross-encoder used by hierarchical RAG (keyword overlap is the fallback)
+    use_cross_encoder: bool = _env_flag("USE_CROSS_ENCODER", True)
+    cross_encoder_model: str = "cross-encoder/ms-marco-MiniLM-L6-v2"
+    rerank_cache_path: str = _env("RERANK_CACHE_PATH", "./rerank_cache.db")
+    rerank_cache_ttl: int = 7 * 24 * 3600
+    rerank_cache_max_rows: int = 100_000
+
+    # Data configuration: path to dataset and batch size for processing
+    data_path: str = _env("DATA_PATH", "./data/filtered_arxiv_2020.json")
+    batch_size: int = 100
+
+    # Gemini safety settings: defines allowed content categories and moderation thresholds
+    gemini_safety_settings: Tuple[dict, ...] = (
+        {
+            "category": "HARM_CATEGORY_HARASSMENT",
+            "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+        },
+        {
+            "category": "HARM_CATEGORY_HATE_SPEECH",
+            "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+        },
+        {
+            "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+            "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+        },
+        {
+            "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
+            "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+        }
+    )
+
+
+load_env()
+
+CONFIG = Config()
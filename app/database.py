@@ -1,10 +1,23 @@
-import chromadb
-from chromadb.config import Settings
+import hashlib
 import logging
-from app.config import CHROMA_DB_PATH, COLLECTION_NAME
+import orjson
+from app.config import CONFIG
+from app.embedding_cache import content_hash, get_embedding_cache
+from app.memory import conversation_memory
 
 logger = logging.getLogger(__name__)
 
+# Time-to-live for cached search results, in seconds
+SEARCH_RESULTS_TTL = 300
+
+
+def _query_key(query):
+    """
+    Build a stable cache key for a query from its normalized text.
+    """
+    return hashlib.sha256(query.strip().lower().encode()).hexdigest()
+
+
 class VectorDatabase:
     """
     A wrapper class for managing a ChromaDB persistent vector database.
@@ -14,69 +27,250 @@ class VectorDatabase:
     def __init__(self):
         """
         Initialize the ChromaDB client and collection.
-        ChromaDB automatically generates embeddings for documents.
+        Documents and queries share one embedding function (all-MiniLM-L6-v2),
+        so query vectors can be computed and cached outside of Chroma.
         """
-        self.client = chromadb.PersistentClient(path=CHROMA_DB_PATH)
+        # Imported here so that importing this module stays cheap
+        import chromadb
+        from chromadb.utils import embedding_functions
+
+        self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        self.client = chromadb.PersistentClient(path=CONFIG.chroma_db_path)
         self.collection = self.client.get_or_create_collection(
-            name=COLLECTION_NAME,
+            name=CONFIG.collection_name,
+            embedding_function=self.embedding_function,
             metadata={"hnsw:space": "cosine"}  # cosine distance metric for similarity search
         )
         logger.info("Vector database initialized (using ChromaDB embeddings)")
     
-    def add_documents(self, documents, metadatas=None, ids=None):
+    def add_documents(self, documents, metadatas=None, ids=None, batch_size=None):
         """
-        Add documents to the ChromaDB collection.
+        Add documents to the ChromaDB collection in batches of the configured batch size.
+        Embeddings of previously seen document texts are taken from the embedding cache.
 
         Parameters:
             documents (list[str]): List of documents to insert.
             metadatas (list[dict], optional): Metadata entries associated with documents.
             ids (list[str], optional): Unique IDs for documents. Auto-generated if omitted.
+            batch_size (int, optional): Documents per insert call. Defaults to CONFIG.batch_size.
         """
+        batch_size = batch_size or CONFIG.batch_size
         try:
-            if ids is None:
-                ids = [f"doc_{i}" for i in range(len(documents))]
-
-            # ChromaDB automatically generates embeddings for the input documents
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas or [{}] * len(documents),
-                ids=ids
-            )
-            logger.info(f"Added {len(documents)} documents to database")
+            for start in range(0, len(documents), batch_size):
+                end = start + batch_size
+                batch = documents[start:end]
+                self.collection.add(
+                    documents=batch,
+                    embeddings=self.embed_documents(batch),
+                    metadatas=metadatas[start:end] if metadatas else None,
+                    ids=ids[start:end] if ids else [f"doc_{i}" for i in range(start, min(end, len(documents)))]
+                )
+            logger.info("Added %s documents to database", len(documents))
         
         except Exception as e:
-            logger.error(f"Error adding documents: {str(e)}")
+            logger.error("Error adding documents: %s", e)
             raise
     
-    def search(self, query, top_k=3, filter_metadata=None):
+    def embed_documents(self, documents):
+        """
+        Compute document embeddings, running the embedding model only on
+        texts that are not in the persistent embedding cache yet.
+
+        Parameters:
+            documents (list[str]): Document texts to embed.
+
+        Returns:
+            list[np.ndarray]: One embedding per document (float32).
+        """
+        cache = get_embedding_cache()
+        hashes = [content_hash(doc) for doc in documents]
+        embeddings = cache.get_many(hashes)
+
+        # Duplicate texts within the batch are embedded once
+        missing = {h: doc for h, doc in zip(hashes, documents) if h not in embeddings}
+        if missing:
+            computed = self.embedding_function(list(missing.values()))
+            fresh = list(zip(missing, computed))
+            cache.put_many(fresh)
+            embeddings.update(fresh)
+
+        logger.info("Embedded %s documents (%s from cache)", len(documents), len(documents) - len(missing))
+        return [embeddings[h] for h in hashes]
+
+    def embed(self, query):
+        """
+        Compute the embedding for a query, reusing a cached vector when available.
+
+        Parameters:
+            query (str): Input text to embed.
+
+        Returns:
+            np.ndarray: Query embedding (float32).
+        """
+        return self.embed_many([query])[0]
+
+    def embed_many(self, queries):
+        """
+        Compute embeddings for several queries, running the embedding model
+        once over all queries that are not cached yet.
+
+        Parameters:
+            queries (list[str]): Input texts to embed.
+
+        Returns:
+            list[np.ndarray]: Query embeddings (float32), in input order.
+        """
+        keys = [_query_key(query) for query in queries]
+        vectors = {}
+        missing = {}
+        for key, query in zip(keys, queries):
+            if key in vectors or key in missing:
+                continue
+            embedding = conversation_memory.get_cached_embedding(key)
+            if embedding is None:
+                missing[key] = query
+            else:
+                vectors[key] = embedding
+
+        if missing:
+            # Repeated queries are embedded only once
+            computed = self.embedding_function(list(missing.values()))
+            for key, embedding in zip(missing, computed):
+                conversation_memory.cache_embedding(key, embedding)
+                vectors[key] = embedding
+        return [vectors[key] for key in keys]
+
+    def search(self, query, top_k=3, filter_metadata=None, include_documents=True):
         """
         Perform a similarity search in the vector database.
 
         Parameters:
             query (str): Input text used to compute the query embedding.
+                Embeddings and results are cached by the hash of the normalized query.
             top_k (int): Number of search results to return.
             filter_metadata (dict, optional): Optional filtering of records by metadata.
+            include_documents (bool): Whether to return document bodies; when False
+                only ids, metadata and distances are fetched.
 
         Returns:
             dict: Search results including documents and metadata.
         """
-        try:
-            search_params = {
-                "query_texts": [query],  # ChromaDB generates the query embedding
-                "n_results": top_k
-            }
+        return self.search_batch(
+            [query], top_k=top_k, filters=[filter_metadata], include_documents=include_documents
+        )[0]
 
+    def search_batch(self, queries, top_k=3, filters=None, include_documents=True):
+        """
+        Perform similarity searches for several queries at once.
+
+        All uncached queries are embedded in a single pass. ChromaDB applies
+        one `where` clause per call, so queries sharing the same filter are
+        sent together in one collection.query call.
+
+        Parameters:
+            queries (list[str]): Input texts to search for.
+            top_k (int): Number of search results to return per query.
+            filters (list[dict | None], optional): Metadata filter for each query.
+            include_documents (bool): Whether to return document bodies.
+
+        Returns:
+            list[dict]: Search results for each query, in the same shape as search().
+                A query that fails gets empty documents and metadatas.
+        """
+        filters = filters or [None] * len(queries)
+        empty = {"documents": [], "metadatas": []}
+        results = [empty] * len(queries)
+
+        results_keys = []
+        pending = []
+        for i, (query, filter_metadata) in enumerate(zip(queries, filters)):
+            results_key = f"{_query_key(query)}:{top_k}"
+            if not include_documents:
+                results_key += ":ids"
             if filter_metadata:
-                search_params["where"] = filter_metadata
-            
-            results = self.collection.query(**search_params)
+                filter_key = orjson.dumps(filter_metadata, option=orjson.OPT_SORT_KEYS)
+                results_key += f":{hashlib.sha256(filter_key).hexdigest()}"
+            results_keys.append(results_key)
 
-            logger.info(f"Search found {len(results['documents'][0])} results")
+            cached_results = conversation_memory.get_cached_search_results(results_key)
+            if cached_results:
+                logger.info("Search cache hit (%s results)", len(cached_results['ids'][0]))
+                results[i] = cached_results
+            else:
+                pending.append(i)
+
+        if not pending:
             return results
-        
+
+        try:
+            # Precomputed embeddings bypass Chroma's per-call embedding step
+            embeddings = dict(zip(pending, self.embed_many([queries[i] for i in pending])))
         except Exception as e:
-            logger.error(f"Search error: {str(e)}")
-            return {"documents": [], "metadatas": []}
+            logger.error("Search error: %s", e)
+            return results
+
+        include = ["metadatas", "distances"]
+        if include_documents:
+            include.append("documents")
+
+        groups = {}
+        for i in pending:
+            filter_key = orjson.dumps(filters[i], option=orjson.OPT_SORT_KEYS)
+            groups.setdefault(filter_key, []).append(i)
+
+        for group in groups.values():
+            try:
+                search_params = {
+                    "query_embeddings": [embeddings[i] for i in group],
+                    "n_results": top_k,
+                    "include": include
+                }
 
+                filter_metadata = filters[group[0]]
+                if filter_metadata:
+                    search_params["where"] = filter_metadata
 
-vector_db = VectorDatabase()
+                batch_results = self.collection.query(**search_params)
+
+                for row, i in enumerate(group):
+                    # Only the fields consumed by the RAG pipeline are kept
+                    query_results = {
+                        field: [batch_results[field][row]] if batch_results.get(field) else None
+                        for field in ("ids", "documents", "metadatas", "distances")
+                    }
+                    conversation_memory.cache_search_results(results_keys[i], query_results, ttl=SEARCH_RESULTS_TTL)
+                    results[i] = query_results
+
+                    logger.info("Search found %s results", len(query_results['ids'][0]))
+
+            except Exception as e:
+                logger.error("Search error: %s", e)
+
+        return results
+
+    def fetch_documents(self, ids):
+        """
+        Fetch document bodies by id.
+
+        Parameters:
+            ids (list[str]): Ids of the documents to fetch.
+
+        Returns:
+            dict: Document body for each id that was found.
+        """
+        try:
+            fetched = self.collection.get(ids=list(ids), include=["documents"])
+            return dict(zip(fetched["ids"], fetched["documents"]))
+        except Exception as e:
+            logger.error("Document fetch error: %s", e)
+            return {}
+
+def __getattr__(name):
+    """
+    Create the shared VectorDatabase on first access (PEP 562), so ChromaDB
+    is only loaded by code paths that actually use the database.
+    """
+    if name == "vector_db":
+        globals()["vector_db"] = VectorDatabase()
+        return globals()["vector_db"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,81 @@
+import hashlib
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from app.config import CONFIG
+from app.sqlite_cache import SQLiteCache
+
+
+def content_hash(text: str) -> str:
+    """
+    Build the cache key for a document from its content.
+    """
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+class EmbeddingCache(SQLiteCache):
+    """
+    Persistent cache of document embeddings keyed by
+    (content hash, provider, model), so re-ingesting unchanged documents
+    does not run the embedding model again. Vectors are stored as float32
+    bytes and the table is capped at `max_rows`.
+    """
+
+    table = "embeddings"
+    schema = (
+        "CREATE TABLE IF NOT EXISTS embeddings("
+        "hash TEXT, provider TEXT, model TEXT, vec BLOB, created_at REAL, "
+        "PRIMARY KEY(hash, provider, model))",
+        "CREATE INDEX IF NOT EXISTS embeddings_created_at ON embeddings(created_at)",
+    )
+    label = "Embedding cache"
+    prune_every = 10_000
+
+    def __init__(
+        self,
+        path: str = CONFIG.embedding_cache_path,
+        provider: str = CONFIG.embedding_provider,
+        model: str = CONFIG.embedding_model,
+        max_rows: int = CONFIG.embedding_cache_max_rows
+    ):
+        self.provider = provider
+        self.model = model
+        super().__init__(path, max_rows)
+
+    def get_many(self, hashes: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Return the cached embeddings for the given content hashes; missing ones are omitted.
+        """
+        if not hashes:
+            return {}
+        placeholders = ",".join("?" * len(hashes))
+        rows = self._read(
+            "SELECT hash, vec FROM embeddings "
+            f"WHERE provider=? AND model=? AND hash IN ({placeholders})",
+            (self.provider, self.model, *hashes)
+        )
+        return {content: np.frombuffer(vec, dtype=np.float32) for content, vec in rows}
+
+    def put_many(self, embeddings: Iterable[Tuple[str, np.ndarray]]):
+        """
+        Save (content hash, embedding) pairs.
+        """
+        now = time.time()
+        self._write(
+            "INSERT OR REPLACE INTO embeddings(hash, provider, model, vec, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                (content, self.provider, self.model, np.asarray(vec, dtype=np.float32).tobytes(), now)
+                for content, vec in embeddings
+            )
+        )
+
+
+@lru_cache(maxsize=None)
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Open the shared EmbeddingCache on first use, so the database file is
+    only created when documents are actually added.
+    """
+    return EmbeddingCache()
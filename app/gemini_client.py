@@ -1,11 +1,52 @@
-import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+import asyncio
 import logging
-import time
+import random
 import os
-from app.config import GEMINI_API_KEY
+from typing import AsyncIterator
+from app.config import CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Transient server-side errors worth retrying; any other error fails fast
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+)
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """
+    Compute how long to wait before the next Gemini API attempt.
+    Honors the server-provided retry delay on quota errors, otherwise uses
+    capped exponential backoff with jitter to avoid synchronized retries.
+    """
+    if isinstance(error, google_exceptions.ResourceExhausted):
+        for detail in getattr(error, "details", None) or []:
+            retry_delay = getattr(detail, "retry_delay", None)
+            if retry_delay is not None:
+                server_delay = retry_delay.seconds + retry_delay.nanos / 1e9
+                return min(CONFIG.gemini_retry_max_delay, server_delay)
+
+    delay = min(CONFIG.gemini_retry_max_delay, CONFIG.gemini_retry_base_delay * 2 ** attempt)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _generation_config(temperature: float) -> dict:
+    """
+    Sampling parameters shared by regular and streaming requests.
+    """
+    return {
+        "temperature": temperature,
+        "top_p": 0.8,
+        "top_k": 40,
+        "max_output_tokens": 2048,
+    }
+
+
 class GeminiClient:
     """
     Client wrapper for interacting with the Google Gemini API.
@@ -17,19 +58,24 @@ class GeminiClient:
         Initialize the Gemini API client.
         Ensures that the API key is available and configures the model.
         """
-        if not GEMINI_API_KEY:
+        if not CONFIG.gemini_api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
-        
-        genai.configure(api_key=GEMINI_API_KEY)
+
+        # Imported here so that importing this module stays cheap
+        import google.generativeai as genai
+
+        genai.configure(api_key=CONFIG.gemini_api_key)
 
         # Initialize a stable Gemini model
         self.model = genai.GenerativeModel('gemini-2.0-flash')
 
         logger.info("Gemini client initialized with model: gemini-2.0-flash")
     
-    def generate_response(self, prompt: str, temperature: float = 0.1) -> str:
+    async def generate_response(self, prompt: str, temperature: float = 0.1) -> str:
         """
         Generate a text response from the Gemini model.
+        Uses the async API so the event loop keeps serving other requests
+        while the model call (and any retry backoff) is in flight.
 
         Parameters:
             prompt (str): Text input to send to the model.
@@ -38,19 +84,11 @@ class GeminiClient:
         Returns:
             str: Model-generated response.
         """
-        max_retries = 3
-        retry_delay = 2
-        
-        for attempt in range(max_retries):
+        for attempt in range(CONFIG.gemini_max_retries):
             try:
-                response = self.model.generate_content(
+                response = await self.model.generate_content_async(
                     prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=temperature,
-                        top_p=0.8,
-                        top_k=40,
-                        max_output_tokens=2048,
-                    )
+                    generation_config=_generation_config(temperature)
                 )
                 
                 if response.text:
@@ -59,13 +97,54 @@ class GeminiClient:
                     logger.warning("Empty response from Gemini")
                     return "I couldn't generate a response for this question. Please try again."
                 
+            except RETRYABLE_ERRORS as e:
+                if attempt == CONFIG.gemini_max_retries - 1:
+                    logger.error("All Gemini API attempts failed: %s", e)
+                    break
+
+                delay = _retry_delay(e, attempt)
+                logger.warning("Gemini API attempt %s failed: %s. Retrying in %.1fs", attempt + 1, e, delay)
+                await asyncio.sleep(delay)
+
             except Exception as e:
-                logger.warning(f"Gemini API attempt {attempt + 1} failed: {str(e)}")
-                
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay * (attempt + 1))
-                else:
-                    logger.error(f"All Gemini API attempts failed: {str(e)}")
-                    return "Sorry, I'm experiencing technical difficulties. Please try again later."
+                # Invalid arguments, permission errors and blocked prompts won't succeed on retry
+                logger.error("Gemini API request failed: %s", e)
+                break
+
+        return "Sorry, I'm experiencing technical difficulties. Please try again later."
+
+    async def stream_response(self, prompt: str, temperature: float = 0.1) -> AsyncIterator[str]:
+        """
+        Stream a text response from the Gemini model as it is generated.
 
-gemini_client = GeminiClient()
+        Parameters:
+            prompt (str): Text input to send to the model.
+            temperature (float): Controls output randomness.
+
+        Yields:
+            str: Text fragments in generation order.
+        """
+        try:
+            response = await self.model.generate_content_async(
+                prompt,
+                generation_config=_generation_config(temperature),
+                stream=True
+            )
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+
+        except Exception as e:
+            logger.error("Gemini streaming request failed: %s", e)
+            yield "Sorry, I'm experiencing technical difficulties. Please try again later."
+
+
+def __getattr__(name):
+    """
+    Create the shared GeminiClient on first access (PEP 562), so the Gemini SDK
+    is only loaded by code paths that actually call the model.
+    """
+    if name == "gemini_client":
+        globals()["gemini_client"] = GeminiClient()
+        return globals()["gemini_client"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
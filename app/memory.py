@@ -1,11 +1,20 @@
 from typing import List, Dict, Any
-import redis
-import json
+from collections import OrderedDict, deque
+from itertools import islice
+import numpy as np
+import orjson
 import logging
+import threading
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Idle sessions expire from Redis after this many seconds
+CONVERSATION_TTL = 86400
+
+# Upper bound on in-memory cache entries (embeddings and search results)
+MEMORY_CACHE_MAX_ENTRIES = 1024
+
 class ConversationMemory:
     """
     Manages conversation history and embedding cache using Redis when available,
@@ -22,41 +31,72 @@ class ConversationMemory:
 
         if redis_url:
             try:
+                # Imported here so the client library is only loaded when Redis is configured
+                import redis
+
                 self.redis_client = redis.Redis.from_url(redis_url)
                 self.redis_client.ping()
                 logger.info("Redis connected successfully")
             except Exception as e:
-                logger.warning(f"Redis connection failed: {e}. Using in-memory storage.")
+                logger.warning("Redis connection failed: %s. Using in-memory storage.", e)
                 self.redis_client = None
         
-        self._memory_cache = {}
+        self._memory_cache = OrderedDict()
+        self._memory_cache_lock = threading.Lock()
         self._conversation_history = {}
     
+    def _memory_set(self, key: str, data: Any, ttl: int):
+        """
+        Store a value in the in-memory cache, evicting the least recently
+        used entries once the cache holds MEMORY_CACHE_MAX_ENTRIES items.
+        """
+        with self._memory_cache_lock:
+            self._memory_cache[key] = {
+                "data": data,
+                "expires": datetime.now() + timedelta(seconds=ttl)
+            }
+            self._memory_cache.move_to_end(key)
+            while len(self._memory_cache) > MEMORY_CACHE_MAX_ENTRIES:
+                self._memory_cache.popitem(last=False)
+
+    def _memory_get(self, key: str) -> Any:
+        """
+        Read a value from the in-memory cache, dropping it if it has expired.
+        """
+        with self._memory_cache_lock:
+            cache_item = self._memory_cache.get(key)
+            if cache_item is None:
+                return None
+            if cache_item["expires"] <= datetime.now():
+                del self._memory_cache[key]
+                return None
+            self._memory_cache.move_to_end(key)
+            return cache_item["data"]
+
     def cache_embedding(self, key: str, embedding: List[float], ttl: int = 3600):
         """
         Store an embedding vector in cache (Redis or in-memory).
+        Vectors are stored as raw float32 bytes in Redis.
         
         Parameters:
             key (str): Unique cache key.
-            embedding (List[float]): Embedding vector.
+            embedding (List[float] | np.ndarray): Embedding vector.
             ttl (int): Time-to-live in seconds.
         """
         try:
+            embedding = np.asarray(embedding, dtype=np.float32)
             if self.redis_client:
                 self.redis_client.setex(
                     f"embedding:{key}",
                     timedelta(seconds=ttl),
-                    json.dumps(embedding)
+                    embedding.tobytes()
                 )
             else:
-                self._memory_cache[f"embedding:{key}"] = {
-                    "data": embedding,
-                    "expires": datetime.now() + timedelta(seconds=ttl)
-                }
+                self._memory_set(f"embedding:{key}", embedding, ttl)
         except Exception as e:
-            logger.error(f"Cache set failed: {e}")
+            logger.error("Cache set failed: %s", e)
     
-    def get_cached_embedding(self, key: str) -> List[float]:
+    def get_cached_embedding(self, key: str) -> np.ndarray:
         """
         Retrieve an embedding from cache.
 
@@ -64,25 +104,63 @@ class ConversationMemory:
             key (str): Cache key for the embedding.
 
         Returns:
-            List[float] | None: Cached embedding or None if not found or expired.
+            np.ndarray | None: Cached float32 embedding or None if not found or expired.
         """
         try:
             if self.redis_client:
                 cached = self.redis_client.get(f"embedding:{key}")
-                return json.loads(cached) if cached else None
+                return np.frombuffer(cached, dtype=np.float32) if cached else None
             else:
-                cache_item = self._memory_cache.get(f"embedding:{key}")
-                if cache_item and cache_item["expires"] > datetime.now():
-                    return cache_item["data"]
-                return None
+                return self._memory_get(f"embedding:{key}")
+        except Exception as e:
+            logger.error("Cache get failed: %s", e)
+            return None
+    
+    def cache_search_results(self, key: str, results: Dict[str, Any], ttl: int = 300):
+        """
+        Store vector search results in cache (Redis or in-memory).
+
+        Parameters:
+            key (str): Unique cache key.
+            results (Dict[str, Any]): Search results to cache.
+            ttl (int): Time-to-live in seconds.
+        """
+        try:
+            if self.redis_client:
+                self.redis_client.setex(
+                    f"results:{key}",
+                    timedelta(seconds=ttl),
+                    orjson.dumps(results)
+                )
+            else:
+                self._memory_set(f"results:{key}", results, ttl)
         except Exception as e:
-            logger.error(f"Cache get failed: {e}")
+            logger.error("Cache set failed: %s", e)
+
+    def get_cached_search_results(self, key: str) -> Dict[str, Any]:
+        """
+        Retrieve vector search results from cache.
+
+        Parameters:
+            key (str): Cache key for the results.
+
+        Returns:
+            Dict[str, Any] | None: Cached results or None if not found or expired.
+        """
+        try:
+            if self.redis_client:
+                cached = self.redis_client.get(f"results:{key}")
+                return orjson.loads(cached) if cached else None
+            else:
+                return self._memory_get(f"results:{key}")
+        except Exception as e:
+            logger.error("Cache get failed: %s", e)
             return None
     
     def store_conversation(self, session_id: str, question: str, answer: str, sources: List[str]):
         """
         Store a QA pair in the conversation history for a given session.
-        Keeps only the last 10 messages.
+        Keeps only the last 10 messages; Redis writes go out in a single round-trip.
         """
         conversation = {
             "timestamp": datetime.now().isoformat(),
@@ -93,15 +171,18 @@ class ConversationMemory:
         
         try:
             if self.redis_client:
-                self.redis_client.lpush(f"conversation:{session_id}", json.dumps(conversation))
-                self.redis_client.ltrim(f"conversation:{session_id}", 0, 9)
+                key = f"conversation:{session_id}"
+                with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.lpush(key, orjson.dumps(conversation))
+                    pipe.ltrim(key, 0, 9)
+                    pipe.expire(key, CONVERSATION_TTL)
+                    pipe.execute()
             else:
                 if session_id not in self._conversation_history:
-                    self._conversation_history[session_id] = []
-                self._conversation_history[session_id].insert(0, conversation)
-                self._conversation_history[session_id] = self._conversation_history[session_id][:10]
+                    self._conversation_history[session_id] = deque(maxlen=10)
+                self._conversation_history[session_id].appendleft(conversation)
         except Exception as e:
-            logger.error(f"Conversation storage failed: {e}")
+            logger.error("Conversation storage failed: %s", e)
     
     def get_conversation_history(self, session_id: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -117,12 +198,29 @@ class ConversationMemory:
         try:
             if self.redis_client:
                 history = self.redis_client.lrange(f"conversation:{session_id}", 0, limit - 1)
-                return [json.loads(item) for item in reversed(history)]
+                return [orjson.loads(item) for item in reversed(history)]
             else:
-                return self._conversation_history.get(session_id, [])[:limit]
+                return list(islice(self._conversation_history.get(session_id, ()), limit))
         except Exception as e:
-            logger.error(f"Conversation retrieval failed: {e}")
+            logger.error("Conversation retrieval failed: %s", e)
             return []
+
+    def get_formatted_history(self, session_id: str, limit: int = 3) -> str:
+        """
+        Return recent conversation history formatted as "Q: ...\nA: ..." pairs
+        for prompt construction.
+
+        Parameters:
+            session_id (str): Conversation session identifier.
+            limit (int): Maximum number of messages to include.
+
+        Returns:
+            str: Formatted history, or an empty string if there is none.
+        """
+        history = self.get_conversation_history(session_id, limit)
+        return "\n".join(
+            f"Q: {conv['question']}\nA: {conv['answer']}" for conv in reversed(history)
+        )
     
     def clear_conversation(self, session_id: str):
         """
@@ -137,7 +235,7 @@ class ConversationMemory:
             else:
                 self._conversation_history.pop(session_id, None)
         except Exception as e:
-            logger.error(f"Conversation clear failed: {e}")
+            logger.error("Conversation clear failed: %s", e)
 
 
 conversation_memory = ConversationMemory()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 from enum import Enum
 
@@ -13,6 +13,19 @@ class RAGStrategy(str, Enum):
     ADAPTIVE = "adaptive"
 
 
+# Lookup table for resolving strategy names without scanning the enum
+_STRATEGY_BY_NAME = {strategy.value: strategy for strategy in RAGStrategy}
+
+
+def _normalize_strategy(value):
+    """
+    Resolve strategy names case-insensitively before enum validation.
+    """
+    if isinstance(value, str):
+        return _STRATEGY_BY_NAME.get(value.lower(), value)
+    return value
+
+
 class QueryRequest(BaseModel):
     """
     Request model for sending a research question to the RAG system.
@@ -26,6 +39,8 @@ class QueryRequest(BaseModel):
     top_k: int = Field(default=3, ge=1, le=10, description="Number of results (1-10)")
     strategy: RAGStrategy = Field(default=RAGStrategy.BASIC, description="RAG strategy to use")
 
+    _validate_strategy = field_validator("strategy", mode="before")(_normalize_strategy)
+
 
 class RAGStrategyRequest(BaseModel):
     """
@@ -42,6 +57,8 @@ class RAGStrategyRequest(BaseModel):
     strategy: RAGStrategy = RAGStrategy.BASIC
     session_id: str = "default"
 
+    _validate_strategy = field_validator("strategy", mode="before")(_normalize_strategy)
+
 
 class QueryResponse(BaseModel):
     """
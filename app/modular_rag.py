@@ -1,11 +1,73 @@
 from enum import Enum
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Callable, Iterable, Union
 import logging
-from app.database import vector_db
-from app.config import TOP_K_RESULTS
+import re
+import threading
+import numpy as np
+from cachetools import TTLCache
+from app import database
+from app.config import CONFIG
+from app.rerank_cache import get_rerank_cache, question_hash
 
 logger = logging.getLogger(__name__)
 
+# Words ignored when extracting keywords from a question
+_STOP_WORDS = frozenset({"what", "is", "the", "a", "an", "in", "on", "at", "to", "for", "of", "with", "by"})
+
+# Question words used to estimate question complexity
+_SIMPLE_INDICATORS = frozenset({"what", "who", "when", "where"})
+_COMPLEX_INDICATORS = frozenset({"how", "why", "compare", "difference", "advantages", "disadvantages"})
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Rank offset for reciprocal rank fusion of hybrid results
+RRF_K = 60
+
+# Document bodies, either as a list or as a loader taking document indices
+Documents = Union[List[str], Callable[[Iterable[int]], List[str]]]
+
+
+def _load_documents(documents: Documents, indices: Iterable[int]) -> List[str]:
+    """
+    Return the bodies of the documents at the given indices.
+    """
+    if callable(documents):
+        return documents(indices)
+    return [documents[i] for i in indices]
+
+
+@lru_cache(maxsize=1024)
+def assess_question_complexity(question: str) -> str:
+    """
+    Determine question complexity from the question words it contains.
+    Results are memoized, since the same questions tend to repeat.
+    """
+    words = set(_WORD_PATTERN.findall(question.lower()))
+    
+    if words & _COMPLEX_INDICATORS:
+        return "complex"
+    elif words & _SIMPLE_INDICATORS:
+        return "medium"
+    return "simple"
+
+
+@lru_cache(maxsize=None)
+def get_reranker():
+    """
+    Load the cross-encoder reranker once per process.
+    Returns None when it is disabled or cannot be loaded,
+    in which case keyword overlap is used instead.
+    """
+    if not CONFIG.use_cross_encoder:
+        return None
+    try:
+        from sentence_transformers import CrossEncoder
+        return CrossEncoder(CONFIG.cross_encoder_model, max_length=512)
+    except Exception as e:
+        logger.warning("Cross-encoder unavailable, using keyword reranking: %s", e)
+        return None
+
 
 class RAGStrategy(Enum):
     """
@@ -26,21 +88,32 @@ class ModularRAG:
     def __init__(self):
         """
         Initialize strategy mapping for dynamic dispatch.
+        Keys are strategy values, so a request needs a single dict lookup
+        whether it passes a RAGStrategy member or a plain string.
         """
         self.strategies = {
-            RAGStrategy.BASIC: self._basic_rag,
-            RAGStrategy.HIERARCHICAL: self._hierarchical_rag,
-            RAGStrategy.HYBRID: self._hybrid_rag,
-            RAGStrategy.ADAPTIVE: self._adaptive_rag
+            RAGStrategy.BASIC.value: self._basic_rag,
+            # Hierarchical RAG retrieves broadly, then narrows to top_k
+            RAGStrategy.HIERARCHICAL.value: lambda question, top_k=3, **kwargs: self._hierarchical_rag(
+                question, broad_top_k=10, final_top_k=top_k
+            ),
+            RAGStrategy.HYBRID.value: self._hybrid_rag,
+            RAGStrategy.ADAPTIVE.value: self._adaptive_rag
         }
+        
+        # Recent retrieval results, shared by the worker threads running execute_rag
+        self._results_cache = TTLCache(maxsize=CONFIG.rag_cache_max_entries, ttl=CONFIG.rag_cache_ttl)
+        self._results_lock = threading.Lock()
     
     def execute_rag(self, question: str, strategy: RAGStrategy = RAGStrategy.BASIC, **kwargs):
         """
         Execute a selected RAG strategy.
+        Results are cached for a short time by normalized question,
+        strategy and parameters, so repeated questions skip retrieval and reranking.
 
         Args:
             question (str): User query.
-            strategy (RAGStrategy): Selected retrieval strategy.
+            strategy (RAGStrategy | str): Selected retrieval strategy.
             kwargs: Additional parameters for specific strategies.
 
         Returns:
@@ -49,32 +122,44 @@ class ModularRAG:
         Raises:
             ValueError: If an unknown strategy is provided.
         """
-        if isinstance(strategy, str):
-            strategy = RAGStrategy(strategy.lower())
+        key = strategy.value if isinstance(strategy, Enum) else str(strategy).lower()
         
-        if strategy not in self.strategies:
+        strategy_fn = self.strategies.get(key)
+        if strategy_fn is None:
             raise ValueError(f"Unknown strategy: {strategy}")
         
-        logger.info(f"Executing {strategy.value} RAG for: {question}")
+        cache_key = (" ".join(question.lower().split()), key, tuple(sorted(kwargs.items())))
+        with self._results_lock:
+            cached = self._results_cache.get(cache_key)
+        if cached is not None:
+            logger.info("RAG cache hit for: %s", question)
+            return cached
         
-        # Special handling for hierarchical RAG parameters
-        if strategy == RAGStrategy.HIERARCHICAL:
-            return self._hierarchical_rag(
-                question,
-                broad_top_k=10,
-                final_top_k=kwargs.get('top_k', 3)
-            )
+        logger.info("Executing %s RAG for: %s", key, question)
+        results = strategy_fn(question, **kwargs)
         
-        return self.strategies[strategy](question, **kwargs)
+        # Empty results are not cached, so a failed search is retried next time
+        if results.get('documents'):
+            with self._results_lock:
+                self._results_cache[cache_key] = results
+        return results
+    
+    def clear_cache(self):
+        """
+        Drop all cached retrieval results.
+        """
+        with self._results_lock:
+            self._results_cache.clear()
     
-    def _basic_rag(self, question: str, top_k: int = TOP_K_RESULTS) -> Dict[str, Any]:
+    def _basic_rag(self, question: str, top_k: int = CONFIG.top_k_results) -> Dict[str, Any]:
         """
         Perform standard semantic vector search.
         """
-        results = vector_db.search(question, top_k=top_k)
+        results = database.vector_db.search(question, top_k=top_k)
         return {
             "documents": results['documents'][0] if results['documents'] else [],
             "metadatas": results['metadatas'][0] if results['metadatas'] else [],
+            "ids": results['ids'][0] if results.get('ids') else [],
             "strategy": "basic",
             "search_type": "semantic"
         }
@@ -85,37 +170,52 @@ class ModularRAG:
         1. Broad retrieval
         2. Reranking and narrowing results
         """
-        broad_results = vector_db.search(question, top_k=broad_top_k)
+        # The broad stage only needs ids and metadata; document bodies are
+        # fetched for the rerank-cache misses and the final results
+        broad_results = database.vector_db.search(question, top_k=broad_top_k, include_documents=False)
+        ids = broad_results['ids'][0] if broad_results.get('ids') else []
         
-        if not broad_results['documents']:
+        if not ids and not broad_results.get('documents'):
             return {
                 "documents": [],
                 "metadatas": [],
+                "ids": [],
                 "strategy": "hierarchical",
                 "search_type": "two_stage"
             }
         
-        reranked_docs = self._rerank_documents(question, broad_results['documents'][0])
+        metadatas = broad_results['metadatas'][0] if broad_results.get('metadatas') else []
+        if broad_results.get('documents'):
+            documents = broad_results['documents'][0]
+        else:
+            documents = self._document_loader(ids)
         
-        final_docs = reranked_docs[:final_top_k]
-        final_metadatas = broad_results['metadatas'][0][:final_top_k] if broad_results['metadatas'] else []
+        order = self._rerank_documents(question, documents, ids)[:final_top_k]
+        final_docs = _load_documents(documents, order)
+        final_metadatas = [metadatas[i] for i in order] if metadatas else []
+        final_ids = [ids[i] for i in order] if ids else []
         
         return {
             "documents": final_docs,
             "metadatas": final_metadatas,
+            "ids": final_ids,
             "strategy": "hierarchical",
             "search_type": "two_stage"
         }
     
-    def _hybrid_rag(self, question: str, top_k: int = TOP_K_RESULTS, alpha: float = 0.5) -> Dict[str, Any]:
+    def _hybrid_rag(self, question: str, top_k: int = CONFIG.top_k_results, alpha: float = 0.5) -> Dict[str, Any]:
         """
         Hybrid RAG combining semantic and keyword-based search.
         """
-        semantic_results = vector_db.search(question, top_k=top_k)
         keywords = self._extract_keywords(question)
         
         if keywords:
-            keyword_results = self._keyword_search(keywords, top_k=top_k)
+            # Both legs search with the question embedding; only the keyword filter differs
+            semantic_results, keyword_results = database.vector_db.search_batch(
+                [question, question],
+                top_k=top_k,
+                filters=[None, self._keyword_filter(keywords)]
+            )
             combined_results = self._merge_results(semantic_results, keyword_results, alpha)
             return {
                 **combined_results,
@@ -124,12 +224,12 @@ class ModularRAG:
             }
         
         return {
-            **semantic_results,
+            **self._basic_rag(question, top_k),
             "strategy": "hybrid",
             "search_type": "semantic_only"
         }
     
-    def _adaptive_rag(self, question: str, top_k: int = TOP_K_RESULTS) -> Dict[str, Any]:
+    def _adaptive_rag(self, question: str, top_k: int = CONFIG.top_k_results) -> Dict[str, Any]:
         """
         Adaptive RAG that selects a strategy based on question complexity.
         """
@@ -142,92 +242,136 @@ class ModularRAG:
         else:
             return self._hierarchical_rag(question, broad_top_k=15, final_top_k=top_k)
     
-    def _rerank_documents(self, question: str, documents: List[str]) -> List[str]:
+    def _rerank_documents(self, question: str, documents: Documents, ids: List[str] = None) -> List[int]:
         """
-        Simple keyword-overlap reranker.
+        Rank documents by relevance to the question.
+
+        Scores (question, document) pairs with the cross-encoder in one
+        batched forward pass, falling back to vectorized keyword overlap when
+        the model is not available. When document ids are given, scores are cached per
+        (question, id) and only unseen documents are sent to the model.
+        `documents` may be a loader, so bodies are only fetched when needed.
+
+        Returns:
+            List[int]: Document indices, most relevant first.
         """
-        scored_docs = []
-        for doc in documents:
-            score = sum(1 for word in question.lower().split() if word in doc.lower())
-            scored_docs.append((score, doc))
+        reranker = get_reranker()
+        if reranker is not None:
+            try:
+                scores = self._cross_encoder_scores(reranker, question, documents, ids)
+                return np.argsort(-scores, kind="stable").tolist()
+            except Exception as e:
+                logger.warning("Cross-encoder reranking failed: %s", e)
         
-        scored_docs.sort(key=lambda x: x[0], reverse=True)
-        return [doc for _, doc in scored_docs]
+        count = len(ids) if callable(documents) else len(documents)
+        scores = self._keyword_overlap_scores(question, _load_documents(documents, range(count)))
+        return np.argsort(-scores, kind="stable").tolist()
     
-    def _extract_keywords(self, question: str) -> List[str]:
+    def _document_loader(self, ids: List[str]) -> Callable[[Iterable[int]], List[str]]:
         """
-        Extract keywords from the user query by filtering stop words.
+        Build a loader returning document bodies by index, fetching each
+        body from the vector database at most once.
         """
-        stop_words = {"what", "is", "the", "a", "an", "in", "on", "at", "to", "for", "of", "with", "by"}
-        words = question.lower().split()
-        keywords = [word for word in words if len(word) > 3 and word not in stop_words]
-        return keywords[:5]
+        bodies = {}
+        
+        def load(indices: Iterable[int]) -> List[str]:
+            indices = list(indices)
+            missing = [ids[i] for i in indices if ids[i] not in bodies]
+            if missing:
+                bodies.update(database.vector_db.fetch_documents(missing))
+            return [bodies.get(ids[i], "") for i in indices]
+        
+        return load
     
-    def _keyword_search(self, keywords: List[str], top_k: int) -> Dict[str, Any]:
+    def _keyword_overlap_scores(self, question: str, documents: List[str]) -> np.ndarray:
         """
-        Perform keyword-based metadata search.
+        Count the distinct question terms (stop words excluded) found in each document.
+        The vocabulary is fitted on the question only, so one sparse transform
+        of the documents gives every overlap at once.
         """
+        # Imported here so that importing this module stays cheap
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        vectorizer = CountVectorizer(lowercase=True, binary=True, stop_words="english")
         try:
-            filter_conditions = {
-                "$or": [
-                    {"title": {"$in": keywords}} for keyword in keywords
-                ] + [
-                    {"abstract": {"$in": keywords}} for keyword in keywords
-                ]
-            }
-            
-            dummy_query = " ".join(keywords)
-            results = vector_db.search(dummy_query, top_k=top_k, filter_metadata=filter_conditions)
-            return results
-            
-        except Exception as e:
-            logger.warning(f"Keyword search failed: {e}")
-            return {"documents": [], "metadatas": []}
+            vectorizer.fit([question])
+        except ValueError:
+            # Nothing left of the question after stop-word removal
+            return np.zeros(len(documents))
+        
+        return np.asarray(vectorizer.transform(documents).sum(axis=1)).ravel()
     
-    def _merge_results(self, results1: Dict, results2: Dict, alpha: float) -> Dict[str, Any]:
+    def _cross_encoder_scores(self, reranker, question: str, documents: Documents, ids: List[str] = None) -> np.ndarray:
         """
-        Merge semantic and keyword-based search results, removing duplicates.
+        Score documents with the cross-encoder, reusing cached scores by document id.
         """
-        docs1 = results1.get('documents', [[]])[0]
-        docs2 = results2.get('documents', [[]])[0]
-        metas1 = results1.get('metadatas', [[]])[0]
-        metas2 = results2.get('metadatas', [[]])[0]
+        if not ids:
+            pairs = [(question, doc) for doc in documents]
+            return reranker.predict(pairs, batch_size=32, convert_to_numpy=True)
         
-        seen_docs = set()
-        merged_docs = []
-        merged_metas = []
+        cache = get_rerank_cache()
+        qhash = question_hash(question)
+        cached = cache.get_scores(qhash, ids)
+        misses = [i for i, doc_id in enumerate(ids) if doc_id not in cached]
         
-        for doc, meta in zip(docs1, metas1):
-            if doc not in seen_docs:
-                seen_docs.add(doc)
-                merged_docs.append(doc)
-                merged_metas.append(meta)
+        if misses:
+            pairs = [(question, doc) for doc in _load_documents(documents, misses)]
+            new_scores = reranker.predict(pairs, batch_size=32, convert_to_numpy=True)
+            fresh = [(ids[i], score) for i, score in zip(misses, new_scores)]
+            cache.store_scores(qhash, fresh)
+            cached.update(fresh)
         
-        for doc, meta in zip(docs2, metas2):
-            if doc not in seen_docs and len(merged_docs) < len(docs1) + len(docs2):
-                seen_docs.add(doc)
-                merged_docs.append(doc)
-                merged_metas.append(meta)
+        return np.array([cached[doc_id] for doc_id in ids], dtype=np.float32)
+    
+    def _extract_keywords(self, question: str) -> List[str]:
+        """
+        Extract keywords from the user query by filtering stop words.
+        """
+        keywords = [word for word in question.lower().split() if len(word) > 3 and word not in _STOP_WORDS]
+        return keywords[:5]
+    
+    def _keyword_filter(self, keywords: List[str]) -> Dict[str, Any]:
+        """
+        Build the metadata filter used for keyword-based search.
+        """
+        return {
+            "$or": [
+                {"title": {"$in": keywords}},
+                {"abstract": {"$in": keywords}}
+            ]
+        }
+    
+    def _merge_results(self, results1: Dict, results2: Dict, alpha: float) -> Dict[str, Any]:
+        """
+        Merge semantic and keyword-based search results with weighted
+        reciprocal rank fusion: a document scores alpha / (RRF_K + rank) from
+        the semantic list plus (1 - alpha) / (RRF_K + rank) from the keyword list.
+        Duplicates are detected by document id, or by a text prefix when
+        ids are not available.
+        """
+        fused = {}
+        for weight, results in ((alpha, results1), (1 - alpha, results2)):
+            # A failed search comes back with empty lists instead of one row per query
+            docs = (results.get('documents') or [[]])[0]
+            metas = (results.get('metadatas') or [[]])[0] or [{}] * len(docs)
+            ids = (results.get('ids') or [[]])[0] or [None] * len(docs)
+            
+            for rank, (doc_id, doc, meta) in enumerate(zip(ids, docs, metas), 1):
+                key = doc_id if doc_id is not None else doc[:64]
+                entry = fused.setdefault(key, [0.0, doc_id, doc, meta])
+                entry[0] += weight / (RRF_K + rank)
         
+        ranked = sorted(fused.values(), key=lambda entry: entry[0], reverse=True)
         return {
-            "documents": [merged_docs],
-            "metadatas": [merged_metas]
+            "documents": [doc for _, _, doc, _ in ranked],
+            "metadatas": [meta for _, _, _, meta in ranked],
+            "ids": [doc_id for _, doc_id, _, _ in ranked]
         }
     
     def _assess_question_complexity(self, question: str) -> str:
         """
         Determine question complexity based on linguistic indicators.
         """
-        question_lower = question.lower()
-        
-        simple_indicators = {"what", "who", "when", "where"}
-        complex_indicators = {"how", "why", "compare", "difference", "advantages", "disadvantages"}
-        
-        if any(indicator in question_lower for indicator in complex_indicators):
-            return "complex"
-        elif any(indicator in question_lower for indicator in simple_indicators):
-            return "medium"
-        return "simple"
-
+        return assess_question_complexity(question)
 
 modular_rag = ModularRAG()
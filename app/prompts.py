@@ -24,4 +24,18 @@ QUESTION: {question}
 INFORMATION: There are no relevant articles in my knowledge base to answer this question.
 
 POLITE RESPONSE:
-"""
\ No newline at end of file
+"""
+
+# Static pieces of SYSTEM_PROMPT_TEMPLATE, split once at import
+_SYSTEM_PREFIX, _, _system_rest = SYSTEM_PROMPT_TEMPLATE.partition("{context}")
+_SYSTEM_MID, _, _SYSTEM_SUFFIX = _system_rest.partition("{question}")
+
+
+def render_system_prompt(question: str, *context_parts: str) -> str:
+    """
+    Fill SYSTEM_PROMPT_TEMPLATE by joining its precompiled pieces,
+    instead of parsing the format string on every request.
+    The context may be given in several parts, which are joined
+    together with the template in a single pass.
+    """
+    return "".join((_SYSTEM_PREFIX, *context_parts, _SYSTEM_MID, question, _SYSTEM_SUFFIX))
@@ -0,0 +1,85 @@
+import hashlib
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+from app.config import CONFIG
+from app.sqlite_cache import SQLiteCache
+
+
+def question_hash(question: str) -> str:
+    """
+    Build the cache key for a question.
+    """
+    return hashlib.sha1(question.encode()).hexdigest()
+
+
+class RerankCache(SQLiteCache):
+    """
+    Persistent cache of cross-encoder scores keyed by
+    (model, question hash, document id), so repeated questions only
+    score documents that were not seen before. Entries expire after
+    `ttl` seconds and the table is capped at `max_rows`.
+    """
+
+    table = "rerank_scores"
+    schema = (
+        "CREATE TABLE IF NOT EXISTS rerank_scores("
+        "model TEXT, qhash TEXT, docno TEXT, score REAL, created_at REAL, "
+        "PRIMARY KEY(model, qhash, docno))",
+        "CREATE INDEX IF NOT EXISTS rerank_scores_created_at ON rerank_scores(created_at)",
+    )
+    label = "Rerank cache"
+
+    def __init__(
+        self,
+        path: str = CONFIG.rerank_cache_path,
+        model: str = CONFIG.cross_encoder_model,
+        ttl: int = CONFIG.rerank_cache_ttl,
+        max_rows: int = CONFIG.rerank_cache_max_rows
+    ):
+        self.model = model
+        self.ttl = ttl
+        super().__init__(path, max_rows)
+        self.prune()
+
+    def get_scores(self, qhash: str, doc_ids: List[str]) -> Dict[str, float]:
+        """
+        Return the cached scores for the given documents; missing or expired ones are omitted.
+        """
+        if not doc_ids:
+            return {}
+        placeholders = ",".join("?" * len(doc_ids))
+        return dict(self._read(
+            "SELECT docno, score FROM rerank_scores "
+            f"WHERE model=? AND qhash=? AND created_at>=? AND docno IN ({placeholders})",
+            (self.model, qhash, time.time() - self.ttl, *doc_ids)
+        ))
+
+    def store_scores(self, qhash: str, scores: Iterable[Tuple[str, float]]):
+        """
+        Save (document id, score) pairs for a question.
+        """
+        now = time.time()
+        self._write(
+            "INSERT OR REPLACE INTO rerank_scores(model, qhash, docno, score, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ((self.model, qhash, doc_id, float(score), now) for doc_id, score in scores)
+        )
+
+    def _delete_expired(self):
+        """
+        Delete scores older than the TTL.
+        """
+        self.conn.execute(
+            "DELETE FROM rerank_scores WHERE created_at<?",
+            (time.time() - self.ttl,)
+        )
+
+
+@lru_cache(maxsize=None)
+def get_rerank_cache() -> RerankCache:
+    """
+    Open the shared RerankCache on first use, so the database file is
+    only created when cross-encoder reranking is actually used.
+    """
+    return RerankCache()
@@ -0,0 +1,93 @@
+import logging
+import sqlite3
+import threading
+from typing import Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCache:
+    """
+    Base class for the persistent SQLite caches.
+
+    Owns the connection, the lock around it and size-based pruning.
+    Subclasses name their `table` (which must have a `created_at` column),
+    list the statements creating it in `schema`, and build their queries
+    on top of `_read` and `_write`.
+    """
+
+    table: str = ""
+    schema: Tuple[str, ...] = ()
+    label: str = "SQLite cache"
+
+    # Prune surplus rows after this many inserted rows
+    prune_every: int = 1000
+
+    def __init__(self, path: str, max_rows: int):
+        """
+        Open (or create) the cache database in WAL mode, which lets
+        readers proceed while another thread is writing.
+        """
+        self.max_rows = max_rows
+        self._writes_since_prune = 0
+
+        # Caches are used from worker threads, so one connection is shared under a lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.schema:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    def _read(self, query: str, params: tuple) -> List[tuple]:
+        """
+        Run a SELECT and return its rows; errors are logged and give no rows.
+        """
+        try:
+            with self._lock:
+                return self.conn.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("%s read failed: %s", self.label, e)
+            return []
+
+    def _write(self, query: str, rows: Iterable[tuple]):
+        """
+        Run an INSERT for each row in one transaction, pruning every `prune_every` rows.
+        """
+        rows = list(rows)
+        try:
+            with self._lock:
+                self.conn.executemany(query, rows)
+                self.conn.commit()
+                self._writes_since_prune += len(rows)
+                should_prune = self._writes_since_prune >= self.prune_every
+        except sqlite3.Error as e:
+            logger.warning("%s write failed: %s", self.label, e)
+            return
+
+        if should_prune:
+            self.prune()
+
+    def _delete_expired(self):
+        """
+        Delete expired rows before size pruning; called with the lock held.
+        Nothing expires by default.
+        """
+
+    def prune(self):
+        """
+        Delete expired rows, then the oldest ones beyond max_rows.
+        """
+        try:
+            with self._lock:
+                self._delete_expired()
+                self.conn.execute(
+                    f"DELETE FROM {self.table} WHERE rowid IN ("
+                    f"SELECT rowid FROM {self.table} ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,)
+                )
+                self.conn.commit()
+                self._writes_since_prune = 0
+        except sqlite3.Error as e:
+            logger.warning("%s prune failed: %s", self.label, e)
@@ -1,18 +1,115 @@
-import json
+import itertools
 import logging
+import mmap
 import os
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import ijson
+import orjson
 from tqdm import tqdm
 
 # Add import path for Docker environment
 sys.path.append('/app')
 
 from app.database import vector_db
-from app.config import DATA_PATH, BATCH_SIZE
+from app.config import CONFIG
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Limit number of processed papers for faster loading
+MAX_PAPERS = 2000
+
+# Insert batch size ramp: doubles from the initial size while throughput improves
+INITIAL_BATCH_SIZE = 64
+MAX_BATCH_SIZE = 1024
+
+# Batches submitted for insertion before the loader waits for the oldest one
+MAX_PENDING_BATCHES = 2
+
+# JSON arrays up to this size are parsed in one pass with orjson; larger ones are streamed
+ORJSON_MAX_BYTES = 256 * 1024 * 1024
+
+
+def iter_papers(path):
+    """
+    Yield paper records from a JSON array or a line-delimited JSON file.
+
+    Line-delimited files are decoded one line at a time with orjson.
+    Arrays are parsed in one pass with orjson from a memory-mapped file
+    when they fit under ORJSON_MAX_BYTES, and streamed with ijson
+    otherwise, so that only the records actually consumed are parsed.
+    """
+    with open(path, 'rb') as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        if first != b'[':
+            for line in f:
+                if line.strip():
+                    yield orjson.loads(line)
+        elif os.path.getsize(path) <= ORJSON_MAX_BYTES:
+            # orjson parses straight from the mapped file, without copying it into a bytes object
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                papers = orjson.loads(view)
+            yield from papers
+        else:
+            yield from ijson.items(f, 'item', use_float=True)
+
+
+class BatchSizeTuner:
+    """
+    Pick the insert batch size with a doubling ramp: the size doubles while
+    the measured insert throughput keeps improving, and once it drops the
+    size steps back to the previous one and stays fixed. The first batch
+    is not measured, since its time includes loading the embedding model.
+    """
+
+    def __init__(self, initial=INITIAL_BATCH_SIZE, maximum=MAX_BATCH_SIZE):
+        self.size = initial
+        self.maximum = maximum
+        self.best_rate = 0.0
+        self.frozen = False
+        self.warmed_up = False
+
+    def record(self, rows, seconds):
+        """
+        Update the batch size from the timing of an inserted batch.
+        Batches of another size than the current one (earlier steps of the
+        ramp or the final partial batch) are ignored.
+        """
+        if self.frozen or rows != self.size:
+            return
+        if not self.warmed_up:
+            self.warmed_up = True
+            return
+
+        rate = rows / max(seconds, 1e-9)
+        if rate > self.best_rate and self.size < self.maximum:
+            self.best_rate = rate
+            self.size = min(self.size * 2, self.maximum)
+        else:
+            if rate <= self.best_rate:
+                self.size //= 2
+            self.frozen = True
+            logger.info(f"Insert batch size settled at {self.size}")
+
+
+def insert_batch(documents, metadatas, ids):
+    """
+    Insert one batch into the vector database.
+
+    Returns:
+        tuple: Number of inserted documents and the time taken in seconds.
+    """
+    start = time.perf_counter()
+    vector_db.add_documents(documents, metadatas, ids, batch_size=len(documents))
+    return len(documents), time.perf_counter() - start
+
 
 def process_arxiv_data():
     """
@@ -21,7 +118,7 @@ def process_arxiv_data():
     """
     logger.info("=== STARTING DATA LOADING ===")
     logger.info(f"Current directory: {os.getcwd()}")
-    logger.info(f"DATA_PATH: {DATA_PATH}")
+    logger.info(f"DATA_PATH: {CONFIG.data_path}")
 
     # Check database state before inserting new documents
     try:
@@ -40,54 +137,66 @@ def process_arxiv_data():
         logger.info("Proceeding with data loading without count verification.")
 
     # Validate dataset file existence
-    if not os.path.exists(DATA_PATH):
-        logger.error(f"Data file not found: {DATA_PATH}")
+    if not os.path.exists(CONFIG.data_path):
+        logger.error(f"Data file not found: {CONFIG.data_path}")
         logger.info(f"Files in current directory: {os.listdir('.')}")
         if os.path.exists('data'):
             logger.info(f"Files in data directory: {os.listdir('data')}")
         return False
 
     try:
-        logger.info(f"Reading data from {DATA_PATH}")
-        with open(DATA_PATH, 'r', encoding='utf-8') as f:
-            papers = json.load(f)
-
-        logger.info(f"Loaded {len(papers)} papers from dataset")
-
-        # Limit number of processed papers for faster loading
-        papers = papers[:2000]
-        logger.info(f"Processing {len(papers)} papers")
-
-        # Containers for batched insertion
-        documents = []
-        metadatas = []
-        ids = []
-
-        for i, paper in enumerate(tqdm(papers, desc="Processing papers")):
-            text_content = create_document_text(paper)
-
-            documents.append(text_content)
-            metadatas.append({
-                "paper_id": paper.get("id", f"unknown_{i}"),
-                "title": paper.get("title", ""),
-                "authors": paper.get("authors", ""),
-                "categories": paper.get("categories", ""),
-                "year": "2020"
-            })
-            ids.append(f"arxiv_{paper.get('id', i)}")
-
-            # Insert in batches
-            if len(documents) >= BATCH_SIZE:
-                logger.info(f"Adding batch of {len(documents)} documents")
-                vector_db.add_documents(documents, metadatas, ids)
-                documents.clear()
-                metadatas.clear()
-                ids.clear()
-
-        # Insert remaining documents
-        if documents:
-            logger.info(f"Adding final batch of {len(documents)} documents")
-            vector_db.add_documents(documents, metadatas, ids)
+        logger.info(f"Reading data from {CONFIG.data_path}")
+        papers = itertools.islice(iter_papers(CONFIG.data_path), MAX_PAPERS)
+        logger.info(f"Processing up to {MAX_PAPERS} papers")
+
+        # Batches are inserted by a background thread while the next one is built;
+        # waiting on the oldest insert keeps at most MAX_PENDING_BATCHES in flight
+        pending = deque()
+        tuner = BatchSizeTuner()
+
+        # Containers for batched insertion, pre-sized to the batch and filled by index
+        size = tuner.size
+        documents, metadatas, ids = [None] * size, [None] * size, [None] * size
+        j = 0
+
+        # Papers repeated in the dataset are only embedded and inserted once
+        seen_ids = set()
+        duplicates = 0
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for i, paper in enumerate(tqdm(papers, total=MAX_PAPERS, desc="Processing papers")):
+                paper_id = get_paper_id(i, paper)
+                if paper_id in seen_ids:
+                    duplicates += 1
+                    continue
+                seen_ids.add(paper_id)
+
+                documents[j], metadatas[j], ids[j] = build_record(paper_id, paper)
+                j += 1
+
+                # Insert in batches
+                if j == size:
+                    logger.info(f"Adding batch of {size} documents")
+                    pending.append(executor.submit(insert_batch, documents, metadatas, ids))
+
+                    if len(pending) >= MAX_PENDING_BATCHES:
+                        tuner.record(*pending.popleft().result())
+
+                    # Fresh lists, since the submitted ones are still being inserted
+                    size = tuner.size
+                    documents, metadatas, ids = [None] * size, [None] * size, [None] * size
+                    j = 0
+
+            # Insert remaining documents
+            if j:
+                logger.info(f"Adding final batch of {j} documents")
+                pending.append(executor.submit(insert_batch, documents[:j], metadatas[:j], ids[:j]))
+
+            for future in pending:
+                future.result()
+
+        if duplicates:
+            logger.info(f"Skipped {duplicates} duplicate papers")
 
         # Check final count after loading
         final_count = vector_db.collection.count()
@@ -101,27 +210,50 @@ def process_arxiv_data():
         return False
 
 
-def create_document_text(paper):
+def get_paper_id(i, paper):
+    """
+    Return the arXiv id of a paper, or a placeholder built from its
+    position `i` in the dataset when it has none.
+    """
+    return paper.get("id") or f"unknown_{i}"
+
+
+def build_record(paper_id, paper):
+    """
+    Build the document text, metadata and id stored for a paper.
+    Each field is read from the record once and shared by the text and metadata.
+    """
+    title = paper.get("title", "")
+    authors = paper.get("authors", "")
+    categories = paper.get("categories", "")
+
+    metadata = {
+        "paper_id": paper_id,
+        "title": title,
+        "authors": authors,
+        "categories": categories,
+        "year": "2020"
+    }
+    text = create_document_text(title, authors, categories, paper.get("abstract", ""))
+    return text, metadata, f"arxiv_{paper_id}"
+
+
+def create_document_text(title, authors, categories, abstract):
     """
     Create formatted text representation of a paper
     suitable for embedding and semantic search.
     """
-    title = paper.get("title", "").strip()
-    abstract = paper.get("abstract", "").strip()
-    authors = paper.get("authors", "").strip()
-    categories = paper.get("categories", "").strip()
-
-    text = f"Title: {title}\n"
+    authors = authors.strip()
+    categories = categories.strip()
 
+    parts = [f"Title: {title.strip()}"]
     if authors:
-        text += f"Authors: {authors}\n"
-
+        parts.append(f"Authors: {authors}")
     if categories:
-        text += f"Categories: {categories}\n"
-
-    text += f"Abstract: {abstract}"
+        parts.append(f"Categories: {categories}")
+    parts.append(f"Abstract: {abstract.strip()}")
 
-    return text
+    return "\n".join(parts)
 
 
 if __name__ == "__main__":
@@ -168,7 +168,8 @@ main() {
         --host 0.0.0.0 \
         --port $port \
         --workers 1 \
-        --loop asyncio
+        --loop uvloop \
+        --http httptools
     
     # This code executes only if exec fails
     echo "FastAPI failed to start"
@@ -2,26 +2,64 @@
 """
 Main module to execute the full test suite.
 Runs integration, RAG quality, and evaluator tests.
+Pass --legacy-subprocess to run each suite in a separate process.
 """
 
+import argparse
+import importlib.util
+import os
 import sys
 import subprocess
-import os
+
+import pytest
+
+TEST_FILES = [
+    "tests/test_api_integration.py",
+    "tests/test_rag_quality.py",
+    "tests/test_rag_quality_metrics.py",
+]
 
 
 def run_all_tests():
     """
-    Run all predefined test suites sequentially.
+    Run the test suites in a single in-process pytest session, followed by
+    the evaluator benchmark, so the interpreter and the application are
+    only loaded once. Tests are spread over all CPU cores when
+    pytest-xdist is installed.
 
     Returns:
         bool: True if all tests passed successfully, False otherwise.
     """
-    test_commands = [
-        ["pytest", "tests/test_api_integration.py", "-v"],
-        ["pytest", "tests/test_rag_quality.py", "-v"],
-        ["pytest", "tests/test_rag_quality_metrics.py", "-v"],
-        ["python", "tests/simple_evaluator.py"]
-    ]
+    print("Running Comprehensive Test Suite...")
+    args = TEST_FILES + ["-v"]
+    if importlib.util.find_spec("xdist"):
+        args += ["-n", "auto"]
+
+    all_passed = pytest.main(args) == pytest.ExitCode.OK
+
+    print("--- Evaluator benchmark ---")
+    try:
+        # simple_evaluator imports its siblings as top-level modules
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from simple_evaluator import run_benchmark
+        run_benchmark()
+    except Exception as e:
+        print(f"ERROR running evaluator benchmark: {e}")
+        all_passed = False
+
+    return all_passed
+
+
+def run_all_tests_in_subprocesses():
+    """
+    Run each test suite in its own subprocess, sequentially.
+    Slower, but isolates the suites from each other.
+
+    Returns:
+        bool: True if all tests passed successfully, False otherwise.
+    """
+    test_commands = [["pytest", path, "-v"] for path in TEST_FILES]
+    test_commands.append(["python", "tests/simple_evaluator.py"])
 
     print("Running Comprehensive Test Suite...")
     all_passed = True
@@ -50,7 +88,15 @@ def run_all_tests():
 
 
 if __name__ == "__main__":
-    success = run_all_tests()
+    parser = argparse.ArgumentParser(description="Run the full test suite.")
+    parser.add_argument(
+        "--legacy-subprocess",
+        action="store_true",
+        help="run each suite in a separate subprocess for isolation"
+    )
+    cli_args = parser.parse_args()
+
+    success = run_all_tests_in_subprocesses() if cli_args.legacy_subprocess else run_all_tests()
 
     if success:
         print("ALL TESTS PASSED SUCCESSFULLY!")
@@ -1,5 +1,7 @@
-import json
-from typing import List, Dict
+import ahocorasick
+import orjson
+from collections import defaultdict
+from typing import List, Dict, Set
 
 
 class BenchmarkDataset:
@@ -10,6 +12,18 @@ class BenchmarkDataset:
     def __init__(self):
         self.test_cases = self._create_test_cases()
 
+        # Test cases never change after creation, so filters are indexed once
+        self._by_category = defaultdict(list)
+        self._by_difficulty = defaultdict(list)
+        for case in self.test_cases:
+            self._by_category[case["category"]].append(case)
+            self._by_difficulty[case.get("difficulty")].append(case)
+
+        self._expected_documents = {
+            case["id"]: frozenset(case["expected_documents"]) for case in self.test_cases
+        }
+        self._keyword_automaton = self._build_keyword_automaton()
+
     def _create_test_cases(self) -> List[Dict]:
         """
         Create predefined test cases for the benchmark dataset.
@@ -41,6 +55,57 @@ class BenchmarkDataset:
             }
         ]
 
+    def _build_keyword_automaton(self) -> ahocorasick.Automaton:
+        """
+        Compile the expected keywords of all test cases into one
+        Aho-Corasick automaton, so a text is matched against every
+        keyword in a single pass.
+
+        Returns:
+            ahocorasick.Automaton: Automaton mapping each lowercased keyword
+                to the (test id, keyword) pairs that expect it
+        """
+        owners = defaultdict(list)
+        for case in self.test_cases:
+            for keyword in case["expected_keywords"]:
+                owners[keyword.lower()].append((case["id"], keyword))
+
+        automaton = ahocorasick.Automaton()
+        for keyword, entries in owners.items():
+            automaton.add_word(keyword, entries)
+        if owners:
+            automaton.make_automaton()
+        return automaton
+
+    def expected_documents(self, test_id: str) -> frozenset:
+        """
+        Return the ids of the documents a test case expects, as a set built once per dataset.
+
+        Args:
+            test_id (str): Test case id
+
+        Returns:
+            frozenset: Expected document ids
+        """
+        return self._expected_documents[test_id]
+
+    def match_keywords(self, text: str) -> Dict[str, Set[str]]:
+        """
+        Find the expected keywords contained in a text (case-insensitive).
+
+        Args:
+            text (str): Text to search, e.g. a retrieved document or an answer
+
+        Returns:
+            Dict[str, Set[str]]: Keywords found, grouped by test case id
+        """
+        found = defaultdict(set)
+        if self._keyword_automaton.kind == ahocorasick.AHOCORASICK:
+            for _, entries in self._keyword_automaton.iter(text.lower()):
+                for test_id, keyword in entries:
+                    found[test_id].add(keyword)
+        return dict(found)
+
     def get_test_cases(self, category: str = None, difficulty: str = None) -> List[Dict]:
         """
         Retrieve test cases with optional filtering by category and difficulty.
@@ -50,23 +115,40 @@ class BenchmarkDataset:
             difficulty (str, optional): Filter by difficulty level. Defaults to None.
 
         Returns:
-            List[Dict]: List of filtered test cases
+            List[Dict]: List of filtered test cases, a new list on every call
+            so callers cannot modify the indexes
         """
-        cases = self.test_cases
-
+        if category and difficulty:
+            return [c for c in self._by_category.get(category, []) if c.get("difficulty") == difficulty]
         if category:
-            cases = [c for c in cases if c["category"] == category]
+            return list(self._by_category.get(category, ()))
         if difficulty:
-            cases = [c for c in cases if c.get("difficulty") == difficulty]
+            return list(self._by_difficulty.get(difficulty, ()))
 
-        return cases
+        return list(self.test_cases)
 
     def save_dataset(self, filepath: str):
         """
-        Save the benchmark dataset to a JSON file.
+        Save the benchmark dataset as NDJSON, one test case per line,
+        so it can be read back incrementally.
 
         Args:
-            filepath (str): Path to save the JSON file
+            filepath (str): Path to save the NDJSON file
+        """
+        with open(filepath, 'wb') as f:
+            for case in self.test_cases:
+                f.write(orjson.dumps(case, option=orjson.OPT_APPEND_NEWLINE))
+
+    @staticmethod
+    def load_dataset(filepath: str) -> List[Dict]:
+        """
+        Load test cases saved by save_dataset.
+
+        Args:
+            filepath (str): Path to the NDJSON file
+
+        Returns:
+            List[Dict]: List of test case dictionaries
         """
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.test_cases, f, indent=2, ensure_ascii=False)
+        with open(filepath, 'rb') as f:
+            return [orjson.loads(line) for line in f if line.strip()]
@@ -8,14 +8,25 @@ from unittest.mock import patch, MagicMock
 # Add project root to sys.path to allow imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from app.main import app
+from app.api import app, limiter
 from app.database import vector_db
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """
+    Reset the API rate limiter before each test, so requests made by
+    earlier tests do not count against the per-minute limits.
+    """
+    limiter.reset()
+
+
+@pytest.fixture(scope="session")
 def client():
     """
-    Fixture for creating a FastAPI test client.
+    Fixture for creating a FastAPI test client, shared by the whole test session.
+    It is not entered as a context manager, so the startup warmup
+    (which calls out to Gemini) does not run during tests.
     
     Returns:
         TestClient: FastAPI test client instance
@@ -23,10 +34,11 @@ def client():
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def real_arxiv_data():
     """
-    Fixture providing sample real arXiv paper data.
+    Fixture providing sample real arXiv paper data, shared by the whole test session.
+    Tests must not modify it.
     
     Returns:
         List[Dict]: List of sample arXiv paper dictionaries
@@ -83,23 +95,24 @@ def mock_vector_db_search():
         Returns:
             Dict: Simulated vector_db.search result
         """
-        documents = []
-        metadatas = []
-
-        for paper in papers:
-            doc_text = (
-                f"Title: {paper['title']}\n"
-                f"Authors: {paper['authors']}\n"
-                f"Categories: {paper['categories']}\n"
+        documents = [
+            "\n".join((
+                f"Title: {paper['title']}",
+                f"Authors: {paper['authors']}",
+                f"Categories: {paper['categories']}",
                 f"Abstract: {paper['abstract']}"
-            )
-            documents.append(doc_text)
-            metadatas.append({
+            ))
+            for paper in papers
+        ]
+        metadatas = [
+            {
                 "paper_id": paper["id"],
                 "title": paper["title"],
                 "authors": paper["authors"],
                 "categories": paper["categories"]
-            })
+            }
+            for paper in papers
+        ]
 
         return {
             'documents': [documents],
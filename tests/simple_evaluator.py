@@ -1,11 +1,44 @@
-import requests
+import asyncio
+import httpx
 import time
 from benchmark_dataset import BenchmarkDataset
 
+API_URL = "http://localhost:8000/query"
+
+
+async def _query(client, test):
+    """
+    Send one test question to the API and time the response.
+
+    Returns:
+        Tuple[Dict, httpx.Response, float]: Test case, API response and response time in seconds.
+    """
+    print(f"Testing: {test['question'][:50]}...")
+
+    start_time = time.perf_counter()
+    response = await client.post(
+        API_URL,
+        json={
+            "question": test["question"],
+            "top_k": 3,
+            "strategy": "basic"
+        }
+    )
+    return test, response, time.perf_counter() - start_time
+
+
+async def _query_all(test_cases):
+    """
+    Send all test questions concurrently over one connection pool.
+    """
+    async with httpx.AsyncClient(timeout=60) as client:
+        return await asyncio.gather(*(_query(client, test) for test in test_cases))
+
 
 def run_benchmark():
     """
     Run benchmark tests for the RAG system by sending queries to the API.
+    Queries are sent concurrently, so the run takes about as long as the slowest one.
 
     Returns:
         List[Dict]: List of results for each test case, including precision and response time.
@@ -15,20 +48,7 @@ def run_benchmark():
 
     results = []
 
-    for test in test_cases:
-        print(f"Testing: {test['question'][:50]}...")
-
-        start_time = time.time()
-        response = requests.post(
-            "http://localhost:8000/query",
-            json={
-                "question": test["question"],
-                "top_k": 3,
-                "strategy": "basic"
-            }
-        )
-        response_time = time.time() - start_time
-
+    for test, response, response_time in asyncio.run(_query_all(test_cases)):
         if response.status_code == 200:
             data = response.json()
 
@@ -37,9 +57,15 @@ def run_benchmark():
             expected_ids = test["expected_documents"]
 
             # Compute simple precision
-            correct = len(set(retrieved_ids) & set(expected_ids))
+            expected_set = dataset.expected_documents(test["id"])
+            correct = sum(1 for doc_id in retrieved_ids if doc_id in expected_set)
             precision = correct / len(retrieved_ids) if retrieved_ids else 0
 
+            # Share of the expected keywords mentioned in the answer
+            answer = data.get("answer", "")
+            found_keywords = dataset.match_keywords(answer).get(test["id"], set())
+            keyword_coverage = len(found_keywords) / len(test["expected_keywords"]) if test["expected_keywords"] else 0
+
             results.append({
                 "test_id": test["id"],
                 "question": test["question"],
@@ -47,17 +73,20 @@ def run_benchmark():
                 "response_time": response_time,
                 "found_documents": retrieved_ids,
                 "expected_documents": expected_ids,
-                "answer_length": len(data.get("answer", ""))
+                "keyword_coverage": keyword_coverage,
+                "answer_length": len(answer)
             })
 
     # Compute average metrics
     avg_precision = sum(r["precision"] for r in results) / len(results) if results else 0
     avg_time = sum(r["response_time"] for r in results) / len(results) if results else 0
+    avg_coverage = sum(r["keyword_coverage"] for r in results) / len(results) if results else 0
 
     # Print benchmark summary
     print("BENCHMARK RESULTS")
     print(f"Average Precision@3: {avg_precision:.2f}")
     print(f"Average Response Time: {avg_time:.2f}s")
+    print(f"Average Keyword Coverage: {avg_coverage:.2f}")
     print(f"Tests Passed: {len([r for r in results if r['precision'] > 0])}/{len(results)}")
 
     return results
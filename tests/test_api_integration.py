@@ -39,23 +39,21 @@ class TestAPIIntegration:
         assert "sources" in data
         assert "context" in data
 
-    def test_query_with_different_strategies(self, client: TestClient):
+    @pytest.mark.parametrize("strategy", ["basic", "hierarchical", "hybrid", "adaptive"])
+    def test_query_with_strategy(self, client: TestClient, strategy):
         """
-        Test the '/query' endpoint with all available RAG strategies.
+        Test the '/query' endpoint with each available RAG strategy.
         """
-        strategies = ["basic", "hierarchical", "hybrid", "adaptive"]
-
-        for strategy in strategies:
-            test_data = {
-                "question": "Explain transformer models",
-                "top_k": 3,
-                "strategy": strategy
-            }
+        test_data = {
+            "question": "Explain transformer models",
+            "top_k": 3,
+            "strategy": strategy
+        }
 
-            response = client.post("/query", json=test_data)
-            assert response.status_code == 200
-            data = response.json()
-            assert data["strategy"] == strategy
+        response = client.post("/query", json=test_data)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["strategy"] == strategy
 
     def test_conversation_endpoints(self, client: TestClient):
         """
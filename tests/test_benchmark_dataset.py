@@ -0,0 +1,104 @@
+from unittest.mock import patch
+from tests.benchmark_dataset import BenchmarkDataset
+
+
+class TestBenchmarkDataset:
+    """Tests for the benchmark dataset helpers."""
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """
+        Test that a saved dataset loads back as the same test cases.
+        """
+        dataset = BenchmarkDataset()
+        path = tmp_path / "benchmark.ndjson"
+
+        dataset.save_dataset(str(path))
+
+        assert BenchmarkDataset.load_dataset(str(path)) == dataset.test_cases
+        assert len(path.read_bytes().splitlines()) == len(dataset.test_cases)
+
+    def test_filter_by_category(self):
+        """
+        Test that the category index returns the matching test cases in order.
+        """
+        dataset = BenchmarkDataset()
+
+        assert [c["id"] for c in dataset.get_test_cases(category="nuclear_physics")] == ["test_001", "test_003"]
+        assert [c["id"] for c in dataset.get_test_cases(category="particle_physics")] == ["test_002"]
+        assert dataset.get_test_cases(category="astrophysics") == []
+
+    def test_filter_by_difficulty(self):
+        """
+        Test that the difficulty index matches the case fields, alone and combined with a category.
+        """
+        cases = [
+            {"id": "a", "category": "x", "difficulty": "easy", "expected_documents": [], "expected_keywords": []},
+            {"id": "b", "category": "x", "difficulty": "hard", "expected_documents": [], "expected_keywords": []},
+            {"id": "c", "category": "y", "difficulty": "easy", "expected_documents": [], "expected_keywords": []},
+        ]
+        with patch.object(BenchmarkDataset, "_create_test_cases", return_value=cases):
+            dataset = BenchmarkDataset()
+
+        assert [c["id"] for c in dataset.get_test_cases(difficulty="easy")] == ["a", "c"]
+        assert [c["id"] for c in dataset.get_test_cases(category="x", difficulty="hard")] == ["b"]
+        assert dataset.get_test_cases(category="y", difficulty="hard") == []
+
+    def test_returned_lists_do_not_change_the_dataset(self):
+        """
+        Test that modifying a returned list leaves the dataset and its indexes unchanged.
+        """
+        dataset = BenchmarkDataset()
+
+        dataset.get_test_cases().clear()
+        dataset.get_test_cases(category="nuclear_physics").append({"id": "extra"})
+
+        assert len(dataset.get_test_cases()) == 3
+        assert [c["id"] for c in dataset.get_test_cases(category="nuclear_physics")] == ["test_001", "test_003"]
+
+    def test_match_keywords_ignores_case(self):
+        """
+        Test that keywords match regardless of case and are reported as written in the test case.
+        """
+        dataset = BenchmarkDataset()
+
+        found = dataset.match_keywords("The PROTON Elastic data from the tevatron and SIGMA_B")
+
+        assert found == {"test_001": {"proton", "elastic"}, "test_002": {"Tevatron", "Sigma_b"}}
+
+    def test_match_keywords_overlapping(self):
+        """
+        Test that keywords contained in or overlapping other keywords are all found.
+        """
+        cases = [
+            {"id": "a", "category": "x", "expected_documents": [], "expected_keywords": ["form factor", "factor"]},
+            {"id": "b", "category": "x", "expected_documents": [], "expected_keywords": ["form", "factor ratio"]},
+        ]
+        with patch.object(BenchmarkDataset, "_create_test_cases", return_value=cases):
+            dataset = BenchmarkDataset()
+
+        found = dataset.match_keywords("the form factor ratio")
+
+        assert found == {"a": {"form factor", "factor"}, "b": {"form", "factor ratio"}}
+
+    def test_match_keywords_repeated(self):
+        """
+        Test that a keyword appearing several times is reported once, and unmatched texts give nothing.
+        """
+        dataset = BenchmarkDataset()
+
+        assert dataset.match_keywords("mass, mass and more mass") == {"test_002": {"mass"}}
+        assert dataset.match_keywords("nothing relevant here") == {}
+
+    def test_expected_documents_hit_count(self):
+        """
+        Test that counting hits against the expected-id set matches list membership on the sample cases.
+        """
+        dataset = BenchmarkDataset()
+        retrieved_ids = ["0706.0128", "0706.3868", "0711.1138", "0706.0128", "9999.0001"]
+
+        for case in dataset.get_test_cases():
+            expected_set = dataset.expected_documents(case["id"])
+            hits = sum(1 for doc_id in retrieved_ids if doc_id in expected_set)
+
+            assert isinstance(expected_set, frozenset)
+            assert hits == sum(1 for doc_id in retrieved_ids if doc_id in case["expected_documents"])
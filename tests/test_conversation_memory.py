@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+from unittest.mock import patch
+from app.memory import ConversationMemory
+
+
+class TestConversationMemory:
+    """Tests for the in-memory conversation history backend."""
+
+    def test_history_keeps_last_ten_messages(self):
+        """
+        Test that only the 10 most recent messages are kept, newest first.
+        """
+        memory = ConversationMemory()
+
+        for i in range(12):
+            memory.store_conversation("session", f"question {i}", f"answer {i}", [])
+
+        history = memory.get_conversation_history("session", limit=20)
+        assert len(history) == 10
+        assert history[0]["question"] == "question 11"
+        assert history[-1]["question"] == "question 2"
+
+    def test_formatted_history_reflects_latest_messages(self):
+        """
+        Test that the prompt history reflects newly stored and cleared messages.
+        """
+        memory = ConversationMemory()
+        assert memory.get_formatted_history("session") == ""
+
+        memory.store_conversation("session", "q1", "a1", [])
+        assert memory.get_formatted_history("session") == "Q: q1\nA: a1"
+
+        memory.store_conversation("session", "q2", "a2", [])
+        assert memory.get_formatted_history("session") == "Q: q1\nA: a1\nQ: q2\nA: a2"
+
+        memory.clear_conversation("session")
+        assert memory.get_formatted_history("session") == ""
+
+    def test_embedding_cache_round_trip(self):
+        """
+        Test that cached embeddings come back as float32 vectors.
+        """
+        memory = ConversationMemory()
+        memory.cache_embedding("key", [0.5, 0.25])
+
+        cached = memory.get_cached_embedding("key")
+        assert cached.dtype == np.float32
+        assert cached.tolist() == [0.5, 0.25]
+        assert memory.get_cached_embedding("missing") is None
+
+    def test_expired_entries_are_dropped(self):
+        """
+        Test that expired cache entries are not returned and are removed on read.
+        """
+        memory = ConversationMemory()
+        memory.cache_search_results("key", {"documents": [["doc"]]}, ttl=-1)
+
+        assert memory.get_cached_search_results("key") is None
+        assert len(memory._memory_cache) == 0
+
+    def test_memory_cache_is_bounded(self):
+        """
+        Test that the in-memory cache evicts the least recently used entries.
+        """
+        memory = ConversationMemory()
+
+        with patch("app.memory.MEMORY_CACHE_MAX_ENTRIES", 2):
+            memory.cache_search_results("a", {"documents": [["a"]]})
+            memory.cache_search_results("b", {"documents": [["b"]]})
+            assert memory.get_cached_search_results("a") is not None
+            memory.cache_search_results("c", {"documents": [["c"]]})
+
+        assert len(memory._memory_cache) == 2
+        assert memory.get_cached_search_results("a") is not None
+        assert memory.get_cached_search_results("b") is None
+        assert memory.get_cached_search_results("c") is not None
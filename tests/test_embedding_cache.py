@@ -0,0 +1,42 @@
+import numpy as np
+from app.embedding_cache import EmbeddingCache, content_hash
+
+
+class TestEmbeddingCache:
+    """Tests for the persistent document embedding cache."""
+
+    def test_embeddings_round_trip(self, tmp_path):
+        """
+        Test that stored embeddings are returned as float32 vectors and unknown hashes are omitted.
+        """
+        cache = EmbeddingCache(str(tmp_path / "embeddings.db"))
+        vector = np.array([0.25, -1.0, 3.5], dtype=np.float32)
+        cache.put_many([(content_hash("paper"), vector)])
+
+        cached = cache.get_many([content_hash("paper"), content_hash("other paper")])
+
+        assert list(cached) == [content_hash("paper")]
+        assert cached[content_hash("paper")].dtype == np.float32
+        assert np.array_equal(cached[content_hash("paper")], vector)
+
+    def test_embeddings_are_separated_by_model(self, tmp_path):
+        """
+        Test that embeddings cached for one provider or model are not returned for another.
+        """
+        path = str(tmp_path / "embeddings.db")
+        EmbeddingCache(path, provider="onnx", model="model-a").put_many([("hash", np.ones(2))])
+
+        assert list(EmbeddingCache(path, provider="onnx", model="model-a").get_many(["hash"])) == ["hash"]
+        assert EmbeddingCache(path, provider="onnx", model="model-b").get_many(["hash"]) == {}
+        assert EmbeddingCache(path, provider="other", model="model-a").get_many(["hash"]) == {}
+
+    def test_prune_keeps_max_rows(self, tmp_path):
+        """
+        Test that pruning keeps at most max_rows embeddings.
+        """
+        cache = EmbeddingCache(str(tmp_path / "embeddings.db"), max_rows=2)
+        cache.put_many([(str(i), np.ones(2)) for i in range(3)])
+        cache.prune()
+
+        count = cache.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        assert count == 2
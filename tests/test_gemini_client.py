@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+from google.api_core import exceptions as google_exceptions
+from app.config import CONFIG
+from app.gemini_client import GeminiClient, _retry_delay
+
+FALLBACK_ANSWER = "Sorry, I'm experiencing technical difficulties. Please try again later."
+
+
+class FakeModel:
+    """Gemini model stand-in that raises the queued errors before answering."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return SimpleNamespace(text="answer")
+
+
+def make_client(model):
+    """Create a GeminiClient around a fake model without configuring the SDK."""
+    client = GeminiClient.__new__(GeminiClient)
+    client.model = model
+    return client
+
+
+class TestGeminiClient:
+    """Tests for Gemini retry classification and backoff."""
+
+    @pytest.mark.parametrize("error_class", [
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.GatewayTimeout,
+        google_exceptions.DeadlineExceeded,
+    ])
+    def test_transient_errors_are_retried(self, error_class):
+        """
+        Test that transient server errors are retried until the call succeeds.
+        """
+        model = FakeModel(error_class("transient"))
+
+        with patch("app.gemini_client.asyncio.sleep", new=AsyncMock()) as sleep:
+            answer = asyncio.run(make_client(model).generate_response("prompt"))
+
+        assert answer == "answer"
+        assert model.calls == 2
+        sleep.assert_awaited_once()
+
+    @pytest.mark.parametrize("error_class", [
+        google_exceptions.InvalidArgument,
+        google_exceptions.PermissionDenied,
+        ValueError,
+    ])
+    def test_other_errors_fail_fast(self, error_class):
+        """
+        Test that non-transient errors return the fallback without retrying.
+        """
+        model = FakeModel(error_class("permanent"))
+
+        with patch("app.gemini_client.asyncio.sleep", new=AsyncMock()) as sleep:
+            answer = asyncio.run(make_client(model).generate_response("prompt"))
+
+        assert answer == FALLBACK_ANSWER
+        assert model.calls == 1
+        sleep.assert_not_awaited()
+
+    def test_retries_are_bounded(self):
+        """
+        Test that persistent transient errors stop after the configured attempts.
+        """
+        errors = [google_exceptions.ServiceUnavailable("down")] * CONFIG.gemini_max_retries
+        model = FakeModel(*errors)
+
+        with patch("app.gemini_client.asyncio.sleep", new=AsyncMock()) as sleep:
+            answer = asyncio.run(make_client(model).generate_response("prompt"))
+
+        assert answer == FALLBACK_ANSWER
+        assert model.calls == CONFIG.gemini_max_retries
+        assert sleep.await_count == CONFIG.gemini_max_retries - 1
+
+    def test_retry_delay_honors_retry_info(self):
+        """
+        Test that the server-provided RetryInfo delay is used for quota errors.
+        """
+        retry_info = SimpleNamespace(retry_delay=SimpleNamespace(seconds=4, nanos=500_000_000))
+        error = google_exceptions.ResourceExhausted("quota", details=[retry_info])
+
+        assert _retry_delay(error, attempt=0) == 4.5
+
+    def test_retry_delay_is_capped(self):
+        """
+        Test that both server delays and exponential backoff respect the maximum delay.
+        """
+        retry_info = SimpleNamespace(retry_delay=SimpleNamespace(seconds=600, nanos=0))
+        error = google_exceptions.ResourceExhausted("quota", details=[retry_info])
+        assert _retry_delay(error, attempt=0) == CONFIG.gemini_retry_max_delay
+
+        backoff = _retry_delay(google_exceptions.ServiceUnavailable("down"), attempt=10)
+        assert backoff <= CONFIG.gemini_retry_max_delay * 1.2
+
+    def test_retry_delay_uses_exponential_backoff(self):
+        """
+        Test that the backoff doubles per attempt, within the jitter range.
+        """
+        error = google_exceptions.ServiceUnavailable("down")
+        expected = CONFIG.gemini_retry_base_delay * 2
+
+        assert expected * 0.8 <= _retry_delay(error, attempt=1) <= expected * 1.2
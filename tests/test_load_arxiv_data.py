@@ -0,0 +1,165 @@
+import dataclasses
+from unittest.mock import MagicMock, patch
+import ijson
+import orjson
+import scripts.load_arxiv_data as loader
+from scripts.load_arxiv_data import BatchSizeTuner, build_record, get_paper_id, iter_papers
+
+PAPERS = [
+    {"id": "2001.00001", "title": "Proton form factors", "abstract": "Elastic scattering.", "score": 0.5},
+    {"id": "2001.00002", "title": "Sigma_b mass", "abstract": "Tevatron data."},
+]
+
+
+class TestIterPapers:
+    """Tests for reading the arXiv dataset file."""
+
+    def test_json_array_is_parsed_from_mapped_file(self, tmp_path):
+        """
+        Test that a JSON array under ORJSON_MAX_BYTES is read with orjson, including leading whitespace.
+        """
+        path = tmp_path / "papers.json"
+        path.write_bytes(b"\n  " + orjson.dumps(PAPERS))
+
+        with patch.object(loader.ijson, "items", wraps=ijson.items) as items:
+            assert list(iter_papers(str(path))) == PAPERS
+        items.assert_not_called()
+
+    def test_large_json_array_is_streamed(self, tmp_path):
+        """
+        Test that a JSON array over ORJSON_MAX_BYTES is streamed with ijson and floats stay floats.
+        """
+        path = tmp_path / "papers.json"
+        path.write_bytes(orjson.dumps(PAPERS))
+
+        with patch.object(loader, "ORJSON_MAX_BYTES", 0), \
+                patch.object(loader.ijson, "items", wraps=ijson.items) as items:
+            papers = list(iter_papers(str(path)))
+
+        items.assert_called_once()
+        assert papers == PAPERS
+        assert isinstance(papers[0]["score"], float)
+
+    def test_ndjson_lines_are_parsed(self, tmp_path):
+        """
+        Test that a line-delimited file yields one record per line and skips blank lines.
+        """
+        path = tmp_path / "papers.json"
+        path.write_bytes(orjson.dumps(PAPERS[0]) + b"\n\n" + orjson.dumps(PAPERS[1]) + b"\n")
+
+        assert list(iter_papers(str(path))) == PAPERS
+
+    def test_empty_array(self, tmp_path):
+        """
+        Test that an empty JSON array yields nothing.
+        """
+        path = tmp_path / "papers.json"
+        path.write_bytes(b"[]")
+
+        assert list(iter_papers(str(path))) == []
+
+
+class TestPaperRecords:
+    """Tests for building the stored records and skipping duplicate papers."""
+
+    def test_paper_id_falls_back_to_position(self):
+        """
+        Test that papers without an id get a placeholder built from their position.
+        """
+        assert get_paper_id(3, {"id": "2001.00001"}) == "2001.00001"
+        assert get_paper_id(3, {"id": ""}) == "unknown_3"
+        assert get_paper_id(3, {}) == "unknown_3"
+
+    def test_build_record(self):
+        """
+        Test that the document id and metadata are built from the paper id and fields.
+        """
+        text, metadata, doc_id = build_record("2001.00001", PAPERS[0])
+
+        assert doc_id == "arxiv_2001.00001"
+        assert metadata["paper_id"] == "2001.00001"
+        assert metadata["title"] == "Proton form factors"
+        assert text.startswith("Title: Proton form factors")
+        assert "Abstract: Elastic scattering." in text
+
+    def test_duplicate_papers_are_inserted_once(self, tmp_path):
+        """
+        Test that papers repeated in the dataset are only inserted the first time.
+        """
+        path = tmp_path / "papers.json"
+        path.write_bytes(orjson.dumps([PAPERS[0], PAPERS[1], PAPERS[0], {"title": "No id"}]))
+        vector_db = MagicMock()
+        vector_db.collection.count.return_value = 0
+
+        with patch.object(loader, "vector_db", vector_db), \
+                patch.object(loader, "CONFIG", dataclasses.replace(loader.CONFIG, data_path=str(path))):
+            assert loader.process_arxiv_data()
+
+        inserted = [
+            doc_id
+            for call in vector_db.add_documents.call_args_list
+            for doc_id in call.args[2]
+        ]
+        assert inserted == ["arxiv_2001.00001", "arxiv_2001.00002", "arxiv_unknown_3"]
+
+
+class TestBatchSizeTuner:
+    """Tests for the insert batch size ramp."""
+
+    def test_first_batch_is_warmup(self):
+        """
+        Test that the first batch does not count, since it includes the model cold start.
+        """
+        tuner = BatchSizeTuner(initial=4, maximum=64)
+        tuner.record(4, 10.0)
+
+        assert tuner.size == 4
+        assert tuner.best_rate == 0.0
+        assert not tuner.frozen
+
+    def test_size_doubles_while_rate_improves(self):
+        """
+        Test that the batch size doubles after each faster batch, up to the maximum.
+        """
+        tuner = BatchSizeTuner(initial=4, maximum=16)
+        tuner.record(4, 1.0)
+        tuner.record(4, 1.0)
+        assert tuner.size == 8
+
+        tuner.record(8, 1.0)
+        assert tuner.size == 16
+
+        tuner.record(16, 1.0)
+        assert tuner.size == 16
+        assert tuner.frozen
+
+    def test_rolls_back_and_freezes_on_regression(self):
+        """
+        Test that a slower batch steps the size back and stops further changes.
+        """
+        tuner = BatchSizeTuner(initial=4, maximum=64)
+        tuner.record(4, 1.0)
+        tuner.record(4, 1.0)
+        tuner.record(8, 4.0)
+
+        assert tuner.size == 4
+        assert tuner.frozen
+
+        tuner.record(4, 0.001)
+        assert tuner.size == 4
+
+    def test_ignores_batches_of_another_size(self):
+        """
+        Test that earlier ramp steps and partial batches do not change the size.
+        """
+        tuner = BatchSizeTuner(initial=4, maximum=64)
+        tuner.record(4, 1.0)
+        tuner.record(4, 1.0)
+        rate = tuner.best_rate
+
+        tuner.record(4, 100.0)
+        tuner.record(3, 0.001)
+
+        assert tuner.size == 8
+        assert tuner.best_rate == rate
+        assert not tuner.frozen
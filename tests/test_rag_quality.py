@@ -1,8 +1,10 @@
 import pytest
 import json
+import numpy as np
 from unittest.mock import Mock, patch
 from app.modular_rag import ModularRAG, RAGStrategy
 from app.database import vector_db
+from app.rerank_cache import RerankCache, question_hash
 
 class TestRAGQuality:
     """RAG system quality tests"""
@@ -50,6 +52,102 @@ class TestRAGQuality:
             assert 'documents' in result
             assert len(result['documents']) > 0
     
+    def test_hierarchical_rag_keeps_metadata_aligned(self, tmp_path):
+        """Test that reranking reorders metadatas and ids together with documents"""
+        rag = ModularRAG()
+        
+        class ReversingReranker:
+            def predict(self, pairs, **kwargs):
+                return np.arange(len(pairs), dtype=np.float32)
+        
+        with patch.object(vector_db, 'search') as mock_search, \
+             patch('app.modular_rag.get_reranker', return_value=ReversingReranker()), \
+             patch('app.modular_rag.get_rerank_cache', return_value=RerankCache(str(tmp_path / "scores.db"))):
+            mock_search.return_value = {
+                'ids': [["a", "b", "c"]],
+                'documents': [["doc a", "doc b", "doc c"]],
+                'metadatas': [[{"title": "A"}, {"title": "B"}, {"title": "C"}]]
+            }
+            
+            result = rag.execute_rag("question", RAGStrategy.HIERARCHICAL, top_k=2)
+            
+            assert result['documents'] == ["doc c", "doc b"]
+            assert result['metadatas'] == [{"title": "C"}, {"title": "B"}]
+            assert result['ids'] == ["c", "b"]
+    
+    def test_hierarchical_rag_fetches_only_needed_documents(self, tmp_path):
+        """Test that the broad stage skips bodies and only cache misses and final results are fetched"""
+        rag = ModularRAG()
+        cache = RerankCache(str(tmp_path / "scores.db"))
+        cache.store_scores(question_hash("question"), [("a", 0.1), ("b", 0.9), ("c", 0.5)])
+        
+        reranker = Mock()
+        reranker.predict.return_value = np.array([0.7], dtype=np.float32)
+        
+        with patch.object(vector_db, 'search') as mock_search, \
+             patch.object(vector_db, 'fetch_documents') as mock_fetch, \
+             patch('app.modular_rag.get_reranker', return_value=reranker), \
+             patch('app.modular_rag.get_rerank_cache', return_value=cache):
+            mock_search.return_value = {
+                'ids': [["a", "b", "c", "d"]],
+                'documents': None,
+                'metadatas': [[{"title": "A"}, {"title": "B"}, {"title": "C"}, {"title": "D"}]]
+            }
+            mock_fetch.side_effect = lambda ids: {doc_id: f"doc {doc_id}" for doc_id in ids}
+            
+            result = rag.execute_rag("question", RAGStrategy.HIERARCHICAL, top_k=2)
+            
+            assert mock_search.call_args.kwargs['include_documents'] is False
+            assert [call.args[0] for call in mock_fetch.call_args_list] == [["d"], ["b"]]
+            assert result['ids'] == ["b", "d"]
+            assert result['documents'] == ["doc b", "doc d"]
+    
+    def test_repeated_question_uses_cached_results(self):
+        """Test that a repeated question is served from the results cache until it is cleared"""
+        rag = ModularRAG()
+        
+        with patch.object(vector_db, 'search') as mock_search:
+            mock_search.return_value = {'documents': [["doc"]], 'metadatas': [[{}]]}
+            
+            first = rag.execute_rag("What are transformers?", RAGStrategy.BASIC, top_k=3)
+            second = rag.execute_rag("  what are TRANSFORMERS? ", "basic", top_k=3)
+            rag.execute_rag("What are transformers?", RAGStrategy.BASIC, top_k=5)
+            assert second == first
+            assert mock_search.call_count == 2
+            
+            rag.clear_cache()
+            rag.execute_rag("What are transformers?", RAGStrategy.BASIC, top_k=3)
+            assert mock_search.call_count == 3
+    
+    def test_keyword_fallback_ranks_by_term_overlap(self):
+        """Test that the keyword fallback ranks documents by shared question terms"""
+        rag = ModularRAG()
+        documents = [
+            "Title: Some Paper\nAbstract: Unrelated content here...",
+            "Title: Attention Is All You Need\nAbstract: Transformer architecture with attention...",
+            "Title: Transformers\nAbstract: A transformer survey..."
+        ]
+        
+        with patch('app.modular_rag.get_reranker', return_value=None):
+            order = rag._rerank_documents("transformer architecture attention mechanism", documents)
+        
+        assert order == [1, 2, 0]
+    
+    def test_merge_results_deduplicates_and_fuses_ranks(self):
+        """Test that hybrid merging deduplicates by id and ranks shared documents first"""
+        rag = ModularRAG()
+        semantic = {'ids': [["a", "b", "c"]], 'documents': [["A", "B", "C"]], 'metadatas': [[{"id": "a"}, {"id": "b"}, {"id": "c"}]]}
+        keyword = {'ids': [["c", "d"]], 'documents': [["C", "D"]], 'metadatas': [[{"id": "c"}, {"id": "d"}]]}
+        
+        merged = rag._merge_results(semantic, keyword, alpha=0.5)
+        
+        assert merged['ids'] == ["c", "a", "b", "d"]
+        assert merged['documents'] == ["C", "A", "B", "D"]
+        assert [meta["id"] for meta in merged['metadatas']] == merged['ids']
+        
+        # With all weight on the semantic ranking, its order wins
+        assert rag._merge_results(semantic, keyword, alpha=1.0)['ids'][:3] == ["a", "b", "c"]
+    
     def test_adaptive_rag_strategy_selection(self):
         """Test that adaptive RAG selects strategy based on question complexity"""
         rag = ModularRAG()
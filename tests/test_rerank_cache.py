@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+from unittest.mock import patch
+from app.modular_rag import ModularRAG
+from app.rerank_cache import RerankCache, question_hash
+
+
+class CountingReranker:
+    """Cross-encoder stand-in that scores a document by its length and records every pair."""
+
+    def __init__(self):
+        self.scored = []
+
+    def predict(self, pairs, **kwargs):
+        self.scored.extend(doc for _, doc in pairs)
+        return np.array([len(doc) for _, doc in pairs], dtype=np.float32)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    Rerank cache stored in a temporary database.
+    """
+    return RerankCache(str(tmp_path / "scores.db"), model="model-a")
+
+
+class TestRerankCache:
+    """Tests for cached cross-encoder scoring."""
+
+    def test_only_unseen_documents_are_scored(self, cache):
+        """
+        Test that a repeated question reuses cached scores and only scores new documents.
+        """
+        rag = ModularRAG()
+        reranker = CountingReranker()
+
+        with patch("app.modular_rag.get_rerank_cache", return_value=cache):
+            first = rag._cross_encoder_scores(reranker, "q", ["a", "bbb", "cc"], ["1", "2", "3"])
+            second = rag._cross_encoder_scores(reranker, "q", ["a", "bbb", "dddd"], ["1", "2", "4"])
+
+        assert first.tolist() == [1, 3, 2]
+        assert second.tolist() == [1, 3, 4]
+        assert reranker.scored == ["a", "bbb", "cc", "dddd"]
+
+    def test_fully_cached_question_skips_model(self, cache):
+        """
+        Test that the model is not called when every document score is cached.
+        """
+        rag = ModularRAG()
+        reranker = CountingReranker()
+        cache.store_scores(question_hash("q"), [("1", 0.5), ("2", 0.9)])
+
+        with patch("app.modular_rag.get_rerank_cache", return_value=cache):
+            scores = rag._cross_encoder_scores(reranker, "q", ["a", "b"], ["1", "2"])
+
+        assert scores.tolist() == pytest.approx([0.5, 0.9])
+        assert reranker.scored == []
+
+    def test_scores_are_separated_by_model(self, tmp_path):
+        """
+        Test that scores cached for one model are not returned for another.
+        """
+        path = str(tmp_path / "scores.db")
+        RerankCache(path, model="model-a").store_scores("qhash", [("1", 0.5)])
+
+        assert RerankCache(path, model="model-a").get_scores("qhash", ["1"]) == {"1": 0.5}
+        assert RerankCache(path, model="model-b").get_scores("qhash", ["1"]) == {}
+
+    def test_prune_drops_expired_and_surplus_rows(self, tmp_path):
+        """
+        Test that pruning removes expired scores and keeps at most max_rows.
+        """
+        path = str(tmp_path / "scores.db")
+        expired = RerankCache(path, model="model-a", ttl=-1)
+        expired.store_scores("old", [("1", 0.1)])
+        assert expired.get_scores("old", ["1"]) == {}
+
+        cache = RerankCache(path, model="model-a", max_rows=2)
+        cache.store_scores("qhash", [("1", 0.1), ("2", 0.2), ("3", 0.3)])
+        cache.prune()
+
+        count = cache.conn.execute("SELECT COUNT(*) FROM rerank_scores").fetchone()[0]
+        assert count == 2
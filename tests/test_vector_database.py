@@ -0,0 +1,141 @@
+import pytest
+import numpy as np
+from unittest.mock import patch
+from app.database import VectorDatabase
+from app.embedding_cache import EmbeddingCache
+from app.memory import ConversationMemory
+
+
+class FakeCollection:
+    """Chroma collection stand-in that records each query call."""
+
+    def __init__(self):
+        self.calls = []
+        self.added = []
+
+    def query(self, query_embeddings, n_results, include, where=None):
+        self.calls.append(where)
+        rows = range(len(query_embeddings))
+        results = {
+            "ids": [[f"doc_{len(self.calls)}_{row}"] for row in rows],
+            "documents": [[f"document {len(self.calls)}.{row}"] for row in rows],
+            "metadatas": [[{"title": "paper"}] for _ in rows],
+            "distances": [[0.1] for _ in rows]
+        }
+        return {field: values for field, values in results.items() if field == "ids" or field in include}
+
+    def add(self, documents, embeddings, metadatas, ids):
+        self.added.append((documents, embeddings, ids))
+
+    def get(self, ids, include):
+        # Like Chroma, results are not guaranteed to follow the requested order
+        return {"ids": ids[::-1], "documents": [f"body of {doc_id}" for doc_id in ids[::-1]]}
+
+
+@pytest.fixture
+def fake_db(tmp_path):
+    """
+    VectorDatabase backed by a fake collection, a counting embedding function,
+    a fresh in-memory cache and a temporary embedding cache.
+    """
+    db = VectorDatabase.__new__(VectorDatabase)
+    db.collection = FakeCollection()
+    db.embedded = []
+
+    def embedding_function(texts):
+        db.embedded.append(list(texts))
+        return [np.ones(4, dtype=np.float32) for _ in texts]
+
+    db.embedding_function = embedding_function
+
+    embedding_cache = EmbeddingCache(str(tmp_path / "embeddings.db"))
+    with patch("app.database.conversation_memory", ConversationMemory()), \
+         patch("app.database.get_embedding_cache", return_value=embedding_cache):
+        yield db
+
+
+class TestVectorDatabase:
+    """Tests for query embedding and search result caching."""
+
+    def test_repeated_search_hits_cache(self, fake_db):
+        """
+        Test that a repeated query is served from cache without embedding or querying again.
+        """
+        first = fake_db.search("Transformer models", top_k=3)
+        second = fake_db.search("  transformer MODELS ", top_k=3)
+
+        assert second == first
+        assert len(fake_db.collection.calls) == 1
+        assert fake_db.embedded == [["Transformer models"]]
+
+    def test_filter_is_part_of_cache_key(self, fake_db):
+        """
+        Test that searches with different filters are cached separately,
+        and that filters with the same content share an entry regardless of key order.
+        """
+        fake_db.search("transformers", filter_metadata={"title": "a", "year": 2020})
+        fake_db.search("transformers", filter_metadata={"year": 2020, "title": "a"})
+        assert len(fake_db.collection.calls) == 1
+
+        fake_db.search("transformers", filter_metadata={"title": "b"})
+        fake_db.search("transformers")
+        assert len(fake_db.collection.calls) == 3
+
+        # The query embedding is computed once and reused across filters
+        assert fake_db.embedded == [["transformers"]]
+
+    def test_search_batch_groups_queries_by_filter(self, fake_db):
+        """
+        Test that batched queries are embedded together and queried once per distinct filter.
+        """
+        keyword_filter = {"title": {"$in": ["transformer"]}}
+        results = fake_db.search_batch(
+            ["question one", "question two", "transformer"],
+            top_k=1,
+            filters=[None, None, keyword_filter]
+        )
+
+        assert fake_db.embedded == [["question one", "question two", "transformer"]]
+        assert fake_db.collection.calls == [None, keyword_filter]
+        assert [r["documents"][0] for r in results] == [
+            ["document 1.0"], ["document 1.1"], ["document 2.0"]
+        ]
+
+    def test_repeated_query_is_embedded_once(self, fake_db):
+        """
+        Test that the same question searched with two filters is embedded only once.
+        """
+        keyword_filter = {"title": {"$in": ["transformer"]}}
+        fake_db.search_batch(["transformer models", "transformer models"], filters=[None, keyword_filter])
+
+        assert fake_db.embedded == [["transformer models"]]
+        assert fake_db.collection.calls == [None, keyword_filter]
+
+    def test_search_without_documents_is_cached_separately(self, fake_db):
+        """
+        Test that an ids-only search skips document bodies and does not share
+        a cache entry with the full search.
+        """
+        ids_only = fake_db.search("transformers", include_documents=False)
+        full = fake_db.search("transformers")
+
+        assert ids_only["documents"] is None
+        assert ids_only["ids"] == [["doc_1_0"]]
+        assert full["documents"] == [["document 2.0"]]
+        assert len(fake_db.collection.calls) == 2
+
+    def test_fetch_documents_maps_bodies_by_id(self, fake_db):
+        """
+        Test that fetched bodies are keyed by id regardless of the returned order.
+        """
+        assert fake_db.fetch_documents(["a", "b"]) == {"a": "body of a", "b": "body of b"}
+
+    def test_add_documents_embeds_only_new_texts(self, fake_db):
+        """
+        Test that re-adding documents reuses cached embeddings and only embeds unseen texts.
+        """
+        fake_db.add_documents(["paper a", "paper b", "paper a"], ids=["1", "2", "3"])
+        fake_db.add_documents(["paper b", "paper c"], ids=["2", "4"])
+
+        assert fake_db.embedded == [["paper a", "paper b"], ["paper c"]]
+        assert [len(embeddings) for _, embeddings, _ in fake_db.collection.added] == [3, 2]